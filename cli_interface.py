@@ -1,20 +1,24 @@
 import chess  # ← MISSING IMPORT - ADD THIS LINE
+import concurrent.futures
+import os
+import sys
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+from itertools import zip_longest
+
+try:
+    import readline  # Not available on all platforms (e.g. vanilla Windows)
+except ImportError:
+    readline = None
+from collections import OrderedDict
 from game_tracker import GameTracker
 from engine import ChessEngine
 from typing import Optional
 
-class ChessCliInterface:
-    """Command-line interface for the chess helper app."""
-    
-    def __init__(self, stockfish_path: Optional[str] = None):
-        self.game = GameTracker()
-        self.engine = ChessEngine(stockfish_path)
-        self.analysis_mode = True  # Whether to show engine analysis
-        self.player_color = None  # Will be set by color selection
-        
-    def print_help(self):
-        """Print available commands."""
-        help_text = """
+_TIMESTAMP_FORMAT = "%Y%m%d_%H%M%S"
+
+_HELP_TEXT = """
 Available commands:
   [move]      - Make a move (e.g., e4, Nf3, O-O, Qxe7+)
   help        - Show this help message
@@ -28,34 +32,260 @@ Available commands:
   reset       - Start a new game
   flip        - Flip board perspective
   quit        - Exit the application
+"""
+
+class ChessCliInterface:
+    """Command-line interface for the chess helper app."""
+
+    # Maximum number of positions to keep analysis results for
+    ANALYSIS_CACHE_SIZE = 256
+
+    # Where readline command history is persisted between sessions
+    HISTORY_FILE = os.path.expanduser("~/.chess_helper_history")
+
+    # Commands that exit the main loop (O(1) lookup, allocated once)
+    _QUIT_CMDS = frozenset(('quit', 'exit', 'q', 'bye'))
+
+    # Constant per-result messages, built once at class creation
+    _RESULT_MESSAGES = {
+        "1-0": "🏆 Game Over! White wins!",
+        "0-1": "🏆 Game Over! Black wins!",
+        "1/2-1/2": "🤝 Game Over! It's a draw!",
+        "*": "Game ongoing",
+    }
+
+    def __init__(self, stockfish_path: Optional[str] = None):
+        self.game = GameTracker()
+        self.engine = ChessEngine(stockfish_path)
+        self.analysis_mode = True  # Whether to show engine analysis
+        self.player_color = None  # Will be set by color selection
+        self._analysis_cache = OrderedDict()  # FEN -> (analysis text, analysis dict)
+        # Background worker so the prompt returns while Stockfish thinks
+        self._analysis_executor = concurrent.futures.ThreadPoolExecutor(max_workers=1)
+        self._pending_analysis = None
+        self._pending_fen = None  # Position the pending future is analyzing
+        # Shared between the main thread and the worker: guards the
+        # analysis cache and brackets every engine entry, so a command
+        # like 'eval' can never drive the Stockfish pipe while a
+        # background search is still on it
+        self._analysis_lock = threading.Lock()
+        self._legal_moves_cache = None  # (fen, moves, moves_lower) for the current position
+        self._board_render_cache = {}  # (fen, player_color) -> rendered board string
+        self._board_output_cache = {}  # (fen, player_color) -> full print_board output
+        # Command dispatch table: one hash lookup per input instead of a
+        # long if/elif chain.  'save' stays outside since it takes an argument.
+        self._commands = {
+            'help': self.print_help,
+            'board': self.print_board,
+            'moves': self.show_legal_moves,
+            'history': self.show_move_history,
+            'undo': self.undo_last_move,
+            'analysis': self.toggle_analysis,
+            'eval': self.show_detailed_evaluation,
+            'flip': self.flip_board,
+            'reset': self.reset_game,
+        }
+
+    def _legal_moves(self) -> list:
+        """
+        Get legal moves for the current position, cached by FEN.
+
+        Move generation is O(n) in python-chess, and several commands
+        (invalid-move suggestions, 'moves') would otherwise regenerate
+        the same list back to back.
+        """
+        return self._legal_moves_cached()[0]
+
+    def _complete(self, text: str, state: int) -> Optional[str]:
+        """
+        Readline tab-completion callback.
+
+        Prefix-matches (case-insensitively) against the cached legal move
+        list, so completion never triggers an engine call or a fresh move
+        generation for the same position.
+        """
+        prefix = text.lower()
+        moves, moves_lower = self._legal_moves_cached()
+        matches = [m for m, ml in zip(moves, moves_lower) if ml.startswith(prefix)]
+        if state < len(matches):
+            return matches[state]
+        return None
+
+    def _setup_readline(self) -> None:
+        """Enable tab-completion and persistent input history, if available."""
+        if readline is None:
+            return
+        readline.parse_and_bind("tab: complete")
+        readline.set_completer(self._complete)
+        try:
+            readline.read_history_file(self.HISTORY_FILE)
+        except OSError:
+            pass  # No history yet
+
+    def _save_readline_history(self) -> None:
+        """Persist input history for the next session."""
+        if readline is None:
+            return
+        try:
+            readline.write_history_file(self.HISTORY_FILE)
+        except OSError:
+            pass
+
+    def _legal_moves_cached(self) -> tuple:
+        """Get (moves, moves_lower) for the current position, cached by FEN."""
+        fen = self.game.get_board_fen()
+        if self._legal_moves_cache is not None and self._legal_moves_cache[0] == fen:
+            return self._legal_moves_cache[1], self._legal_moves_cache[2]
+
+        moves = self.game.get_legal_moves()
+        moves_lower = [m.lower() for m in moves]
+        self._legal_moves_cache = (fen, moves, moves_lower)
+        return moves, moves_lower
+
+    def _get_analysis(self, fen: str) -> tuple:
         """
-        print(help_text)
+        Get (analysis_text, analysis_dict) for a position, cached by FEN.
+
+        Avoids re-running Stockfish on positions already analyzed
+        (e.g. after undo, or repeated 'board'/'eval' commands).
+
+        Runs under _analysis_lock: both the OrderedDict bookkeeping and
+        the engine calls are reached from the main thread and the
+        analysis worker.
+        """
+        with self._analysis_lock:
+            cached = self._analysis_cache.get(fen)
+            if cached is not None:
+                self._analysis_cache.move_to_end(fen)
+                return cached
+
+            analysis = self.engine.analyze_position(fen)
+            analysis_text = self.engine.get_move_analysis_text(fen)
+
+            entry = (analysis_text, analysis)
+            self._analysis_cache[fen] = entry
+            if len(self._analysis_cache) > self.ANALYSIS_CACHE_SIZE:
+                self._analysis_cache.popitem(last=False)
+            return entry
+
+    def _get_analysis_joined(self, fen: str) -> tuple:
+        """
+        Get analysis for a position, joining an in-flight background
+        search for the same FEN instead of re-entering the engine.
+
+        A move followed immediately by 'eval' would otherwise start a
+        second search racing the pending one for the same position.
+        """
+        future = self._pending_analysis
+        if future is not None and self._pending_fen == fen:
+            # Consume the future here so the prompt loop doesn't print
+            # the same analysis a second time
+            self._pending_analysis = None
+            self._pending_fen = None
+            try:
+                return future.result()
+            except Exception:
+                pass  # Cancelled or failed; fall through to a fresh call
+        return self._get_analysis(fen)
+
+    def _submit_analysis(self, fen: str) -> None:
+        """Start engine analysis in the background without blocking the prompt."""
+        if self._pending_analysis is not None:
+            self._pending_analysis.cancel()
+        self._pending_fen = fen
+        self._pending_analysis = self._analysis_executor.submit(self._get_analysis, fen)
+
+    def _discard_pending_analysis(self) -> None:
+        """Drop an in-flight background analysis (its result still lands
+        in the FEN cache; it just won't be printed)."""
+        if self._pending_analysis is not None:
+            self._pending_analysis.cancel()
+            self._pending_analysis = None
+            self._pending_fen = None
+
+    def _flush_pending_analysis(self, timeout: float = 0.05) -> None:
+        """Print a pending background analysis if it has finished."""
+        future = self._pending_analysis
+        if future is None:
+            return
+
+        # The board may have moved on since the search was submitted
+        # (undo/reset); printing that result would advise on the wrong
+        # position, so drop it instead
+        if self._pending_fen != self.game.get_board_fen():
+            self._discard_pending_analysis()
+            return
+
+        try:
+            analysis_text, _ = future.result(timeout=timeout)
+        except concurrent.futures.TimeoutError:
+            return  # Still thinking; check again next prompt
+        except concurrent.futures.CancelledError:
+            self._pending_analysis = None
+            self._pending_fen = None
+            return
+        except Exception as e:
+            self._pending_analysis = None
+            self._pending_fen = None
+            print(f"⚠️  Analysis failed: {e}")
+            return
+
+        self._pending_analysis = None
+        self._pending_fen = None
+        print("\n🤖 Engine Analysis:")
+        print(analysis_text)
+        
+    def print_help(self):
+        """Print available commands."""
+        sys.stdout.write(_HELP_TEXT + "\n")
     
+    def _render_board(self) -> str:
+        """Render the board from the player's perspective, cached by position."""
+        key = (self.game.get_board_fen(), self.player_color)
+        cached = self._board_render_cache.get(key)
+        if cached is None:
+            orientation = chess.BLACK if self.player_color == 'black' else chess.WHITE
+            cached = self.game.board.unicode(invert_color=True, borders=False,
+                                             orientation=orientation)
+            self._board_render_cache[key] = cached
+        return cached
+
     def print_board(self):
         """Print the current board position."""
-        print("\nCurrent position:")
-        
-        # Show board from player's perspective
-        if self.player_color == 'black':
-            # Show board flipped for black player
-            board_str = str(self.game.board).split('\n')
-            board_str.reverse()  # Flip vertically
-            for line in board_str:
-                print(line[::-1])  # Flip horizontally
-        else:
-            print(self.game.get_board_display())
-        
-        # Show position info
+        # The whole block is a pure function of (position, perspective),
+        # so read-only commands like 'board'/'moves'/'history' re-emit
+        # the cached text instead of reserializing the board
+        key = (self.game.get_board_fen(), self.player_color)
+        cached = self._board_output_cache.get(key)
+        if cached is not None:
+            sys.stdout.write(cached)
+            sys.stdout.flush()
+            return
+
+        # Build the full redraw in one buffer: a single write avoids a
+        # stdout lock/flush per line, which dominates redraw latency on
+        # slow consoles
         info = self.game.get_position_info()
-        print(f"\nTo move: {info['turn']}")
-        print(f"Move #{info['move_number']}")
-        
+        parts = [
+            "",
+            "Current position:",
+            self._render_board(),
+            "",
+            f"To move: {info['turn']}",
+            f"Move #{info['move_number']}",
+        ]
+
         if info['is_check']:
-            print("🔥 CHECK!")
+            parts.append("🔥 CHECK!")
         if info['is_checkmate']:
-            print("🏆 CHECKMATE!")
+            parts.append("🏆 CHECKMATE!")
         if info['is_stalemate']:
-            print("🤝 STALEMATE!")
+            parts.append("🤝 STALEMATE!")
+
+        output = "\n".join(parts) + "\n"
+        self._board_output_cache[key] = output
+        sys.stdout.write(output)
+        sys.stdout.flush()
     
     def print_analysis(self):
         """Print engine analysis if available and enabled."""
@@ -67,7 +297,7 @@ Available commands:
             return
         
         print("\n🤖 Engine Analysis:")
-        analysis_text = self.engine.get_move_analysis_text(self.game.get_board_fen())
+        analysis_text, _ = self._get_analysis_joined(self.game.get_board_fen())
         print(analysis_text)
     
     def handle_move(self, move_str: str) -> bool:
@@ -84,45 +314,55 @@ Available commands:
             print(f"\n✅ Move played: {move_str}")
             self.print_board()
             
-            # Show analysis after the move
+            # Kick off analysis in the background so the user can keep typing
             if self.analysis_mode and not self.game.is_game_over():
-                self.print_analysis()
+                if self.engine.is_available():
+                    self._submit_analysis(self.game.get_board_fen())
             
             # Check for game over
             if self.game.is_game_over():
                 result = self.game.get_game_result()
-                result_text = {
-                    "1-0": "🏆 Game Over! White wins!",
-                    "0-1": "🏆 Game Over! Black wins!",
-                    "1/2-1/2": "🤝 Game Over! It's a draw!",
-                    "*": "Game ongoing"
-                }.get(result, "Game over")
+                result_text = self._RESULT_MESSAGES.get(result, "Game over")
                 print(f"\n{result_text}")
             
             return True
         else:
             # More helpful error message
-            legal_moves = self.game.get_legal_moves()
+            legal_moves, legal_moves_lower = self._legal_moves_cached()
             print(f"❌ Invalid move: {move_str}")
-            
-            # Suggest similar moves if possible
-            similar_moves = [m for m in legal_moves if move_str.lower() in m.lower()]
+
+            # Suggest similar moves if possible (stop after 5 hits)
+            needle = move_str.lower()
+            similar_moves = []
+            for m, ml in zip(legal_moves, legal_moves_lower):
+                if needle in ml:
+                    similar_moves.append(m)
+                    if len(similar_moves) == 5:
+                        break
             if similar_moves:
-                print(f"💡 Did you mean: {', '.join(similar_moves[:5])}")
+                print(f"💡 Did you mean: {', '.join(similar_moves)}")
             
             return False
     
     def show_legal_moves(self):
         """Display all legal moves with better formatting."""
-        moves = self.game.get_legal_moves()
+        moves = self._legal_moves()
         if moves:
             print(f"\n⚡ LEGAL MOVES ({len(moves)} available):")
-            
-            # Group moves by type for better readability
-            pawn_moves = [m for m in moves if not any(c in m for c in 'NBRQK')]
-            piece_moves = [m for m in moves if any(c in m for c in 'NBRQ')]
-            king_moves = [m for m in moves if 'K' in m or 'O' in m]
-            
+
+            # Group moves by type for better readability (single pass,
+            # classified by the leading character of the SAN string)
+            pawn_moves, piece_moves, king_moves = [], [], []
+            piece_letters = {'N', 'B', 'R', 'Q'}
+            for m in moves:
+                c = m[0]
+                if c == 'K' or c == 'O':
+                    king_moves.append(m)
+                elif c in piece_letters:
+                    piece_moves.append(m)
+                else:
+                    pawn_moves.append(m)
+
             if pawn_moves:
                 print("  Pawn moves:", "  ".join(pawn_moves))
             if piece_moves:
@@ -134,24 +374,27 @@ Available commands:
     
     def show_move_history(self):
         """Display the move history with improved formatting."""
+        # The tracker maintains the SAN list incrementally; reading it is
+        # an O(1) copy, no replay through the SAN generator
         history = self.game.get_move_history_san()
         if not history:
             print("\n📜 No moves played yet.")
             return
         
-        print(f"\n📜 MOVE HISTORY ({len(history)} moves):")
-        print("─" * 40)
-        
-        # Display moves in pairs (White, Black) with better alignment
-        for i in range(0, len(history), 2):
-            move_num = (i // 2) + 1
-            white_move = history[i]
-            black_move = history[i + 1] if i + 1 < len(history) else ""
-            
-            if black_move:
-                print(f"{move_num:2d}. {white_move:<10s} {black_move}")
-            else:
-                print(f"{move_num:2d}. {white_move}")
+        # Display moves in pairs (White, Black): pulling twice from the
+        # same iterator pairs them up without per-index bounds checks
+        it = iter(history)
+        lines = [
+            f"\n📜 MOVE HISTORY ({len(history)} moves):",
+            "─" * 40,
+        ]
+        lines.extend(
+            f"{move_num:2d}. {white_move:<10s} {black_move}".rstrip()
+            for move_num, (white_move, black_move)
+            in enumerate(zip_longest(it, it, fillvalue=""), 1)
+        )
+        sys.stdout.write("\n".join(lines) + "\n")
+        sys.stdout.flush()
     
     def toggle_analysis(self):
         """Toggle engine analysis on/off."""
@@ -172,42 +415,49 @@ Available commands:
             return
         
         fen = self.game.get_board_fen()
-        analysis = self.engine.analyze_position(fen)
-        
-        print("\n" + "="*50)
-        print("🔍 DETAILED POSITION ANALYSIS")
-        print("="*50)
-        
+        _, analysis = self._get_analysis_joined(fen)
+
+        lines = [
+            "",
+            "=" * 50,
+            "🔍 DETAILED POSITION ANALYSIS",
+            "=" * 50,
+        ]
+
         if analysis.get('evaluation') is not None:
             eval_score = analysis['evaluation']
             if abs(eval_score) > 900:
                 mate_in = int(999 - abs(eval_score))
                 color = "White" if eval_score > 0 else "Black"
-                print(f"📊 Evaluation: {color} mates in {mate_in}")
+                lines.append(f"📊 Evaluation: {color} mates in {mate_in}")
             else:
                 # Convert to more readable format
                 if eval_score > 0:
-                    print(f"📊 Evaluation: +{eval_score:.2f} (White advantage)")
+                    lines.append(f"📊 Evaluation: +{eval_score:.2f} (White advantage)")
                 elif eval_score < 0:
-                    print(f"📊 Evaluation: {eval_score:.2f} (Black advantage)")
+                    lines.append(f"📊 Evaluation: {eval_score:.2f} (Black advantage)")
                 else:
-                    print(f"📊 Evaluation: {eval_score:.2f} (Equal position)")
-        
+                    lines.append(f"📊 Evaluation: {eval_score:.2f} (Equal position)")
+
         best_move = analysis.get('best_move', 'N/A')
-        if best_move != 'N/A':
+        if best_move and best_move != 'N/A':
             san_move = self.engine.convert_uci_to_san(best_move, fen)
             move_display = san_move if san_move else best_move
-            print(f"🎯 Best move: {move_display}")
-        
+            lines.append(f"🎯 Best move: {move_display}")
+
         if analysis.get('top_moves'):
-            print("\n🏆 Top alternatives:")
+            lines.append("")
+            lines.append("🏆 Top alternatives:")
             for i, move_info in enumerate(analysis['top_moves'][:5], 1):
                 san_move = self.engine.convert_uci_to_san(move_info['move'], fen)
                 move_display = san_move if san_move else move_info['move']
                 if move_info['evaluation'] is not None:
-                    print(f"  {i}. {move_display} ({move_info['evaluation']:+.2f})")
+                    lines.append(f"  {i}. {move_display} ({move_info['evaluation']:+.2f})")
                 else:
-                    print(f"  {i}. {move_display}")
+                    lines.append(f"  {i}. {move_display}")
+
+        sys.stdout.write("\n".join(lines) + "\n")
+        sys.stdout.flush()
     
     def save_game(self, filename: Optional[str] = None):
         """Save the current game as PGN with confirmation."""
@@ -216,8 +466,7 @@ Available commands:
             return
             
         if not filename:
-            from datetime import datetime
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            timestamp = datetime.now().strftime(_TIMESTAMP_FORMAT)
             filename = f"chess_game_{timestamp}.pgn"
         
         try:
@@ -237,10 +486,58 @@ Available commands:
                 return
         
         self.game.reset_game()
+        self._discard_pending_analysis()  # Any in-flight search is for the old game
+        self._analysis_cache.clear()
+        self._board_render_cache.clear()
+        self._board_output_cache.clear()
+        self._warmup_engine()
         print("\n🆕 New game started!")
         self.print_board()
         if self.analysis_mode:
             self.print_analysis()
+
+    @contextmanager
+    def _stdout_batch(self):
+        """
+        Collect all writes during a command and flush them in one go.
+
+        Commands like 'eval' and 'history' emit many lines; on a
+        line-buffered TTY each one costs a flush/syscall.  Batching turns
+        that into a single write per command.
+        """
+        sys.stdout.flush()
+        original_write = sys.stdout.write
+        buffer = []
+        sys.stdout.write = buffer.append
+        try:
+            yield
+        finally:
+            sys.stdout.write = original_write
+            sys.stdout.write("".join(buffer))
+            sys.stdout.flush()
+
+    def undo_last_move(self):
+        """Undo the last move and redraw."""
+        if self.game.undo_move():
+            self._discard_pending_analysis()  # Search targets the undone position
+            print("↩️  Move undone!")
+            self._warmup_engine()
+            self.print_board()
+            if self.analysis_mode:
+                self.print_analysis()
+        else:
+            print("❌ No moves to undo.")
+
+    def _warmup_engine(self):
+        """Warm the engine's hash on the current position if it isn't cached."""
+        if not self.analysis_mode or not self.engine.is_available():
+            return
+        fen = self.game.get_board_fen()
+        # Same lock as _get_analysis: a warmup must not hit the pipe
+        # while a background search is mid-flight
+        with self._analysis_lock:
+            if fen not in self._analysis_cache:
+                self.engine.warmup(fen)
     
     def select_player_color(self):
         """Prompt user to select their color with improved UX."""
@@ -277,6 +574,8 @@ Available commands:
     def run(self):
         """Main command loop with improved startup."""
         print("♟️  Welcome to Chess Helper! ♟️")
+
+        self._setup_readline()
         
         # Select player color first
         self.select_player_color()
@@ -297,49 +596,38 @@ Available commands:
         
         while True:
             try:
+                self._flush_pending_analysis()
                 user_input = input("\n♟️  Chess Helper> ").strip()
                 
                 if not user_input:
                     continue
                 
-                # Parse command
-                parts = user_input.split()
-                command = parts[0].lower()
-                args = parts[1:] if len(parts) > 1 else []
+                # Parse command: partition scans once and avoids building
+                # a token list for the common single-word input
+                head, _, rest = user_input.partition(' ')
+                command = head.lower()
+                args = rest.split() if rest else ()
                 
-                if command in ['quit', 'exit', 'q', 'bye']:
+                if command in self._QUIT_CMDS:
                     print("👋 Thanks for using Chess Helper! Good game!")
                     break
-                elif command == 'help':
-                    self.print_help()
-                elif command == 'board':
-                    self.print_board()
-                elif command == 'moves':
-                    self.show_legal_moves()
-                elif command == 'history':
-                    self.show_move_history()
-                elif command == 'undo':
-                    if self.game.undo_move():
-                        print("↩️  Move undone!")
-                        self.print_board()
-                        if self.analysis_mode:
-                            self.print_analysis()
+
+                handler = self._commands.get(command)
+                if handler is not None:
+                    if command == 'reset':
+                        # reset_game prompts for confirmation; don't buffer it
+                        handler()
                     else:
-                        print("❌ No moves to undo.")
-                elif command == 'analysis':
-                    self.toggle_analysis()
-                elif command == 'eval':
-                    self.show_detailed_evaluation()
-                elif command == 'flip':
-                    self.flip_board()
+                        with self._stdout_batch():
+                            handler()
                 elif command == 'save':
                     filename = args[0] if args else None
-                    self.save_game(filename)
-                elif command == 'reset':
-                    self.reset_game()
+                    with self._stdout_batch():
+                        self.save_game(filename)
                 else:
                     # Treat as move input
-                    self.handle_move(user_input)
+                    with self._stdout_batch():
+                        self.handle_move(user_input)
                     
             except KeyboardInterrupt:
                 print("\n\n👋 Exiting Chess Helper...")
@@ -348,6 +636,11 @@ Available commands:
                 print(f"❌ Unexpected error: {e}")
                 print("💡 Type 'help' for available commands")
 
+        self._save_readline_history()
+        # cancel_futures drops a queued search; a running one finishes on
+        # its own thread instead of blocking the quit command
+        self._analysis_executor.shutdown(wait=False, cancel_futures=True)
+
 def main():
     """Main entry point for CLI interface."""
     import sys
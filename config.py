@@ -1,10 +1,18 @@
 """
 Configuration system for Chess Helper
 """
+import atexit
 import json
 import os
+import sys
+import threading
 from typing import Dict, Any, Optional
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass, asdict, fields
+
+try:
+    import orjson  # C-implemented JSON, 2-5x faster than stdlib
+except ImportError:
+    orjson = None
 
 @dataclass
 class ChessConfig:
@@ -48,23 +56,38 @@ class ConfigManager:
     """Manages configuration for Chess Helper."""
     
     CONFIG_FILE = "chess_helper_config.json"
-    
+
+    # How long to wait for further set() calls before writing to disk
+    SAVE_DEBOUNCE_SECONDS = 0.5
+
     def __init__(self):
         self.config = ChessConfig()
+        self._dirty = False
+        self._save_timer: Optional[threading.Timer] = None
+        self._asdict_cache: Optional[dict] = None
+        # Zero-arg callbacks invoked whenever a setting changes, so
+        # components can cache config values instead of re-reading them
+        self._listeners = []
         self.load_config()
+        # Make sure pending debounced changes reach disk on exit
+        atexit.register(self.flush)
     
     def load_config(self) -> None:
         """Load configuration from file."""
         if os.path.exists(self.CONFIG_FILE):
             try:
-                with open(self.CONFIG_FILE, 'r') as f:
-                    data = json.load(f)
-                    
+                # Read whole file then parse: one syscall, and lets orjson
+                # work on raw bytes when it is installed
+                with open(self.CONFIG_FILE, 'rb') as f:
+                    raw = f.read()
+                data = orjson.loads(raw) if orjson is not None else json.loads(raw)
+
                 # Update config with loaded data
                 for key, value in data.items():
                     if hasattr(self.config, key):
                         setattr(self.config, key, value)
-                        
+
+                self._asdict_cache = None
                 print(f"Configuration loaded from {self.CONFIG_FILE}")
             except Exception as e:
                 print(f"Warning: Could not load config file: {e}")
@@ -76,51 +99,120 @@ class ConfigManager:
             # Create directory if it doesn't exist
             os.makedirs(os.path.dirname(self.CONFIG_FILE) if os.path.dirname(self.CONFIG_FILE) else ".", exist_ok=True)
             
-            with open(self.CONFIG_FILE, 'w') as f:
-                json.dump(asdict(self.config), f, indent=2)
-                
+            config_dict = self._get_asdict()
+
+            # Write to a temp file and atomically swap it in: a crash
+            # mid-write can no longer truncate the config, and the rename
+            # guarantee lets us skip a per-save fsync
+            tmp_file = self.CONFIG_FILE + '.tmp'
+            if orjson is not None:
+                with open(tmp_file, 'wb') as f:
+                    f.write(orjson.dumps(config_dict, option=orjson.OPT_INDENT_2))
+            else:
+                with open(tmp_file, 'w') as f:
+                    json.dump(config_dict, f, indent=2)
+            os.replace(tmp_file, self.CONFIG_FILE)
+
             print(f"Configuration saved to {self.CONFIG_FILE}")
         except Exception as e:
             print(f"Warning: Could not save config file: {e}")
     
+    def _get_asdict(self) -> dict:
+        """
+        Get a dict snapshot of the config, cached between mutations.
+
+        asdict() deep-copies every field (including board_colors); both
+        save_config and print_config need the same snapshot, so build it
+        once and invalidate on set()/reset.
+        """
+        if self._asdict_cache is None:
+            self._asdict_cache = asdict(self.config)
+        return self._asdict_cache
+
+    def _schedule_save(self) -> None:
+        """Debounce disk writes: rapid set() calls collapse into one save."""
+        self._dirty = True
+        if self._save_timer is not None:
+            self._save_timer.cancel()
+        self._save_timer = threading.Timer(self.SAVE_DEBOUNCE_SECONDS, self.flush)
+        self._save_timer.daemon = True
+        self._save_timer.start()
+
+    def flush(self) -> None:
+        """Write any pending configuration changes to disk now."""
+        if self._save_timer is not None:
+            self._save_timer.cancel()
+            self._save_timer = None
+        if self._dirty:
+            self._dirty = False
+            self.save_config()
+
+    def close(self) -> None:
+        """Flush pending changes; call before shutdown."""
+        self.flush()
+
+    def add_listener(self, callback) -> None:
+        """Register a zero-arg callback fired after any setting changes."""
+        self._listeners.append(callback)
+
+    def _notify_listeners(self) -> None:
+        """Tell subscribers the configuration changed."""
+        for callback in self._listeners:
+            callback()
+
     def get(self, key: str, default: Any = None) -> Any:
         """Get configuration value."""
         return getattr(self.config, key, default)
-    
+
     def set(self, key: str, value: Any) -> None:
         """Set configuration value."""
         if hasattr(self.config, key):
             setattr(self.config, key, value)
-            self.save_config()
+            self._asdict_cache = None
+            self._notify_listeners()
+            self._schedule_save()
         else:
             raise KeyError(f"Configuration key '{key}' not found")
     
     def reset_to_defaults(self) -> None:
         """Reset configuration to default values."""
         self.config = ChessConfig()
+        self._asdict_cache = None
+        self._notify_listeners()
         self.save_config()
         print("Configuration reset to defaults")
     
     def print_config(self) -> None:
         """Print current configuration."""
-        print("\nCurrent Configuration:")
-        print("-" * 30)
-        
-        config_dict = asdict(self.config)
-        for key, value in config_dict.items():
+        lines = ["", "Current Configuration:", "-" * 30]
+
+        # Iterate fields directly: no deep-copied snapshot needed just to print
+        for field in fields(self.config):
+            value = getattr(self.config, field.name)
             if isinstance(value, dict):
-                print(f"{key}:")
-                for subkey, subvalue in value.items():
-                    print(f"  {subkey}: {subvalue}")
+                lines.append(f"{field.name}:")
+                lines.extend(f"  {subkey}: {subvalue}"
+                             for subkey, subvalue in value.items())
             else:
-                print(f"{key}: {value}")
+                lines.append(f"{field.name}: {value}")
+
+        # One write instead of a flush per field
+        sys.stdout.write("\n".join(lines) + "\n")
 
 # Usage example for your main files:
+_CONFIG_MANAGER: Optional[ConfigManager] = None
+_CONFIG_LOCK = threading.Lock()
+
 def get_config_manager() -> ConfigManager:
-    """Get the global configuration manager."""
-    if not hasattr(get_config_manager, '_instance'):
-        get_config_manager._instance = ConfigManager()
-    return get_config_manager._instance
+    """Get the global configuration manager (thread-safe singleton)."""
+    global _CONFIG_MANAGER
+    # Fast path: plain read, no lock once constructed
+    if _CONFIG_MANAGER is None:
+        with _CONFIG_LOCK:
+            # Double-checked: another thread may have built it while we waited
+            if _CONFIG_MANAGER is None:
+                _CONFIG_MANAGER = ConfigManager()
+    return _CONFIG_MANAGER
 
 # Example integration in your CLI interface:
 def add_config_commands_to_cli(cli_interface):
@@ -134,14 +226,21 @@ def add_config_commands_to_cli(cli_interface):
     def set_config_value(key: str, value: str):
         """Set a configuration value."""
         config_manager = get_config_manager()
-        
-        # Convert string values to appropriate types
-        if value.lower() in ('true', 'false'):
-            value = value.lower() == 'true'
-        elif value.isdigit():
+
+        # Convert string values to appropriate types: int()/float() parse
+        # in one C-level pass, so try them before the boolean words
+        # instead of pre-scanning with isdigit()
+        try:
             value = int(value)
-        elif value.replace('.', '').isdigit():
-            value = float(value)
+        except ValueError:
+            try:
+                value = float(value)
+            except ValueError:
+                lowered = value.lower()
+                if lowered == 'true':
+                    value = True
+                elif lowered == 'false':
+                    value = False
         
         try:
             config_manager.set(key, value)
@@ -181,28 +280,60 @@ class AutoSave:
         self.game_tracker = game_tracker
         self.config = config_manager
         self.last_save_move_count = 0
-    
-    def check_auto_save(self) -> None:
-        """Check if auto-save should be triggered."""
-        if not self.config.get('auto_save', True):
+
+        # Snapshot config values read on every move; the snapshot is
+        # refreshed by the ConfigManager listener when a setting changes
+        self._refresh_config_snapshot()
+        if hasattr(config_manager, 'add_listener'):
+            config_manager.add_listener(self._refresh_config_snapshot)
+
+        # Subscribe to the tracker so saves are triggered exactly once
+        # per committed move instead of being polled externally
+        listeners = getattr(game_tracker, 'move_listeners', None)
+        if listeners is not None:
+            listeners.append(self.on_move_committed)
+
+    def _refresh_config_snapshot(self) -> None:
+        """Re-read the auto-save settings from the config manager."""
+        self._auto_save = self.config.get('auto_save', True)
+        self._interval = self.config.get('auto_save_interval', 10)
+        save_dir = self.config.get('pgn_export_path', './saved_games/')
+        if save_dir != getattr(self, '_save_dir', None):
+            self._save_dir = save_dir
+            # New target directory: make sure it exists again on next save
+            self._dir_ensured = False
+
+    def on_move_committed(self, move_count: int) -> None:
+        """Called by the game tracker after each committed move."""
+        if not self._auto_save:
             return
-        
-        current_move_count = len(self.game_tracker.move_history)
-        interval = self.config.get('auto_save_interval', 10)
-        
-        if current_move_count > 0 and current_move_count % interval == 0:
-            if current_move_count != self.last_save_move_count:
+
+        interval = self._interval
+        if move_count > 0 and move_count % interval == 0:
+            if move_count != self.last_save_move_count:
                 self._perform_auto_save()
-                self.last_save_move_count = current_move_count
+                self.last_save_move_count = move_count
+
+    def check_auto_save(self) -> None:
+        """Check if auto-save should be triggered (legacy polling entry point)."""
+        self.on_move_committed(len(self.game_tracker.move_history))
     
     def _perform_auto_save(self) -> None:
         """Perform automatic save."""
         try:
             from datetime import datetime
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            save_dir = self.config.get('pgn_export_path', './saved_games/')
-            
-            os.makedirs(save_dir, exist_ok=True)
+            # Fixed-format timestamp via f-string: skips strftime's
+            # locale-aware format parsing on every save
+            now = datetime.now()
+            timestamp = (f"{now.year:04d}{now.month:02d}{now.day:02d}"
+                         f"_{now.hour:02d}{now.minute:02d}{now.second:02d}")
+            save_dir = self._save_dir
+
+            # One stat syscall for the lifetime of the directory, not one
+            # per save
+            if not self._dir_ensured:
+                os.makedirs(save_dir, exist_ok=True)
+                self._dir_ensured = True
             filename = os.path.join(save_dir, f"autosave_{timestamp}.pgn")
             
             self.game_tracker.export_pgn(filename)
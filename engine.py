@@ -1,7 +1,36 @@
 import chess
 from stockfish import Stockfish
 from typing import Optional, List, Dict
+import concurrent.futures
+import logging
 import os
+import queue
+import shutil
+import threading
+
+logger = logging.getLogger(__name__)
+
+
+def _resolve_stockfish_path() -> Optional[str]:
+    """Resolve the Stockfish binary location once, at module import.
+
+    Checked in order: the STOCKFISH_PATH environment variable, a
+    stockfish.exe next to this file, then the system PATH.  Per-engine
+    construction (including pool workers and crash recovery) reuses the
+    resolved path instead of re-running the filesystem probes.
+    """
+    env_path = os.environ.get("STOCKFISH_PATH")
+    if env_path:
+        return env_path
+
+    local_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "stockfish.exe")
+    if os.path.exists(local_path):
+        return local_path
+
+    return shutil.which("stockfish")
+
+
+_RESOLVED_STOCKFISH_PATH = _resolve_stockfish_path()
 
 class ChessEngine:
     """Interface for chess engine analysis using Stockfish."""
@@ -19,105 +48,142 @@ class ChessEngine:
         self.depth = depth
         self.stockfish = None
         self.engine_path = stockfish_path
-        
-        # Try to initialize Stockfish
-        self._initialize_engine()
+        # Engine results memoized by position; a full search costs seconds,
+        # so repeated FENs (undo, redraws, batch analysis) must not re-search
+        self._result_cache: Dict[tuple, object] = {}
+        self._pool = None  # Worker pool, created on first batch analysis
+        self._alive = False  # Cached liveness; updated on init/failure/ping
+        self._last_fen: Optional[str] = None  # Position currently set on the engine
+        # Stockfish is spawned lazily on first use: process creation plus
+        # the UCI handshake is wasted work for instances that never analyze
+        self._initialized = False
+        # Serializes every interaction with the Stockfish pipe (and the
+        # state shadowing it: _last_fen, _result_cache, the process
+        # handle itself).  The engine speaks a strict request/response
+        # protocol over stdin/stdout, so two threads driving it at once
+        # interleave writes and consume each other's output.  Reentrant
+        # because public methods call each other (e.g. get_top_moves ->
+        # is_available).
+        self._lock = threading.RLock()
         
     
     # CORE ENGINE FUNCTIONS
     
     def is_available(self) -> bool:
-        """Check if the engine is available for analysis."""
-        if self.stockfish is None:
-            return False
-        
-        # Test if engine is responsive
-        try:
-            # Try a simple operation to check if engine is alive
-            self.stockfish.is_fen_valid("rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1")
-            return True
-        except:
-            # Engine has crashed, mark as unavailable
-            self.stockfish = None
-            return False
+        """
+        Check if the engine is available for analysis.
+
+        Returns the cached liveness flag — every public method calls
+        this, and a real engine round-trip per check would dominate the
+        analysis path.  The flag is cleared whenever an engine call
+        fails; use ping() to actively re-probe the process.
+
+        The first call spawns the Stockfish subprocess.
+        """
+        with self._lock:
+            if not self._initialized:
+                self._initialized = True
+                self._initialize_engine()
+            return self._alive and self.stockfish is not None
+
+    def ping(self) -> bool:
+        """Actively probe the engine process and refresh the liveness flag."""
+        with self._lock:
+            if not self._initialized:
+                self._initialized = True
+                self._initialize_engine()
+            if self.stockfish is None:
+                self._alive = False
+                return False
+
+            try:
+                # Try a simple operation to check if engine is alive
+                self.stockfish.is_fen_valid("rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1")
+                self._alive = True
+            except:
+                # Engine has crashed, mark as unavailable
+                self.stockfish = None
+                self._alive = False
+            return self._alive
     
     def get_best_move(self, fen: str) -> Optional[str]:
         """
         Get the best move for the current position.
-        
+
         Args:
             fen: Position in FEN notation
-            
+
         Returns:
             Best move in UCI notation (e.g., 'e2e4') or None if engine unavailable
         """
-        if not self.is_available():
-            return None
-            
-        try:
-            self.stockfish.set_fen_position(fen)
-            best_move = self.stockfish.get_best_move()
-            return best_move
-        except Exception as e:
-            print(f"Error getting best move: {e}")
-            # Mark engine as crashed
-            self.stockfish = None
-            return None
-    
+        return self._analyze_fused(fen, 1).get('best_move')
+
     def get_evaluation(self, fen: str) -> Optional[float]:
         """
         Get position evaluation in centipawns.
-        
+
         Args:
             fen: Position in FEN notation
-            
+
         Returns:
             Evaluation in centipawns (positive = white advantage) or None
         """
+        return self._analyze_fused(fen, 1).get('evaluation')
+
+    def _analyze_fused(self, fen: str, num_moves: int = 3) -> Dict:
+        """
+        Run a single engine search and derive all analysis fields from it.
+
+        One get_top_moves() call already contains the best move, the
+        evaluation of the first line, and the alternatives — running the
+        three public queries separately would cost three full searches on
+        the same position.
+
+        Args:
+            fen: Position in FEN notation
+            num_moves: Number of principal variations to search
+
+        Returns:
+            Dictionary with 'best_move', 'evaluation', 'top_moves', 'fen'
+        """
         if not self.is_available():
-            return None
-            
-        try:
-            self.stockfish.set_fen_position(fen)
-            evaluation = self.stockfish.get_evaluation()
-            
-            if evaluation['type'] == 'cp':
-                return evaluation['value'] / 100.0  # Convert centipawns to pawns
-            elif evaluation['type'] == 'mate':
+            return {'error': 'Engine not available'}
+
+        top_moves = self.get_top_moves(fen, num_moves)
+
+        best_move = None
+        evaluation = None
+        if top_moves:
+            first = top_moves[0]
+            best_move = first['move']
+            if first.get('mate') is not None:
                 # Convert mate scores to large numbers
-                mate_in = evaluation['value']
+                mate_in = first['mate']
                 if mate_in > 0:
-                    return 999.0 - mate_in  # Positive mate score
+                    evaluation = 999.0 - mate_in  # Positive mate score
                 else:
-                    return -999.0 - mate_in  # Negative mate score
-            
-        except Exception as e:
-            print(f"Error getting evaluation: {e}")
-            # Mark engine as crashed
-            self.stockfish = None
-            return None
-    
+                    evaluation = -999.0 - mate_in  # Negative mate score
+            else:
+                evaluation = first['evaluation']
+
+        return {
+            'best_move': best_move,
+            'evaluation': evaluation,
+            'top_moves': top_moves,
+            'fen': fen
+        }
+
     def analyze_position(self, fen: str) -> Dict:
         """
         Comprehensive position analysis.
-        
+
         Args:
             fen: Position in FEN notation
-            
+
         Returns:
             Dictionary with analysis results
         """
-        if not self.is_available():
-            return {'error': 'Engine not available'}
-        
-        analysis = {
-            'best_move': self.get_best_move(fen),
-            'evaluation': self.get_evaluation(fen),
-            'top_moves': self.get_top_moves(fen, 3),
-            'fen': fen
-        }
-        
-        return analysis
+        return self._analyze_fused(fen, 3)
     
     # ADVANCED ANALYSIS FUNCTIONS
 
@@ -132,54 +198,133 @@ class ChessEngine:
         Returns:
             List of dictionaries with 'move' and 'evaluation' keys
         """
-        if not self.is_available():
-            return []
-            
-        try:
-            self.stockfish.set_fen_position(fen)
-            top_moves = self.stockfish.get_top_moves(num_moves)
-            
-            result = []
-            for move_info in top_moves:
-                move_data = {
-                    'move': move_info['Move'],
-                    'evaluation': move_info['Centipawn'] / 100.0 if move_info['Centipawn'] is not None else None,
-                    'mate': move_info.get('Mate', None)
-                }
-                result.append(move_data)
-            
-            return result
-            
-        except Exception as e:
-            print(f"Error getting top moves: {e}")
-            # Mark engine as crashed
-            self.stockfish = None
-            return []
+        with self._lock:
+            if not self.is_available():
+                return []
+
+            key = ('top_moves', fen, self.depth, num_moves)
+            if key in self._result_cache:
+                return self._result_cache[key]
+
+            try:
+                self._ensure_position(fen)
+                top_moves = self.stockfish.get_top_moves(num_moves)
+
+                result = []
+                for move_info in top_moves:
+                    move_data = {
+                        'move': move_info['Move'],
+                        'evaluation': move_info['Centipawn'] / 100.0 if move_info['Centipawn'] is not None else None,
+                        'mate': move_info.get('Mate', None)
+                    }
+                    result.append(move_data)
+
+                self._store_result(key, result)
+                return result
+
+            except Exception as e:
+                logger.warning("Error getting top moves: %s", e)
+                # Mark engine as crashed
+                self.stockfish = None
+                self._alive = False
+                return []
     
     def analyze_multiple_positions(self, fen_list: List[str]) -> List[Dict]:
-        """Analyze multiple positions efficiently."""
-        results = []
-        for fen in fen_list:
-            analysis = self.analyze_position(fen)
-            results.append(analysis)
-        return results
+        """
+        Analyze multiple positions efficiently.
+
+        Independent positions fan out over a pool of Stockfish workers
+        (one core each), which scales near-linearly for batch game
+        analysis. Single positions stay on this engine.
+        """
+        if len(fen_list) <= 1:
+            return [self.analyze_position(fen) for fen in fen_list]
+
+        if self._pool is None:
+            self._pool = ChessEnginePool(self.engine_path, depth=self.depth)
+        return self._pool.analyze_positions(fen_list)
+
+    def _ensure_position(self, fen: str) -> None:
+        """
+        Set the engine position only if it differs from the last one set.
+
+        set_fen_position resets Stockfish's internal state; skipping the
+        call when the FEN is unchanged preserves that state and avoids a
+        needless engine round-trip.
+        """
+        if fen != self._last_fen:
+            self.stockfish.set_fen_position(fen)
+            self._last_fen = fen
+
+    # CACHE MANAGEMENT
+
+    # Maximum memoized engine results before the cache is dropped
+    RESULT_CACHE_SIZE = 4096
+
+    def _store_result(self, key: tuple, value) -> None:
+        """Memoize an engine result, bounding the cache size."""
+        if len(self._result_cache) >= self.RESULT_CACHE_SIZE:
+            self._result_cache.clear()
+        self._result_cache[key] = value
+
+    def _invalidate_cache(self) -> None:
+        """Drop memoized results (engine settings or process changed)."""
+        self._result_cache.clear()
+        self._last_fen = None
 
     # CONFIGURATION FUNCTIONS
-    
+
     def configure_for_game_analysis(self):
         """Configure engine for live game analysis (faster, less depth)."""
-        if self.is_available():
-            self.stockfish.set_depth(10)  # Faster for real-time
-            self.stockfish.set_time(0.5)   # Quick analysis
-            print("Engine configured for live game analysis")
+        with self._lock:
+            if self.is_available():
+                self.stockfish.set_depth(10)  # Faster for real-time
+                self.stockfish.set_time(0.5)   # Quick analysis
+                self._invalidate_cache()
+                logger.info("Engine configured for live game analysis")
 
     def configure_for_deep_analysis(self):
         """Configure engine for post-game deep analysis."""
-        if self.is_available():
-            self.stockfish.set_depth(20)  # Deeper analysis
-            self.stockfish.set_time(3.0)   # More thorough
-            print("Engine configured for deep analysis")
+        with self._lock:
+            if self.is_available():
+                self.stockfish.set_depth(20)  # Deeper analysis
+                self.stockfish.set_time(3.0)   # More thorough
+                self._invalidate_cache()
+                logger.info("Engine configured for deep analysis")
     
+    def warmup(self, fen: str, depth: int = 12):
+        """
+        Pre-fill the engine's transposition table with a short search.
+
+        Args:
+            fen: Position in FEN notation
+            depth: Depth for the warmup search (lower than analysis depth)
+
+        A quick low-depth search on a position we expect to analyze soon
+        lets the later full-depth search continue iterative deepening from
+        a warm table instead of restarting at depth 1.
+        """
+        with self._lock:
+            if not self.is_available():
+                return
+
+            try:
+                self.stockfish.set_depth(depth)
+                self._ensure_position(fen)
+                self.stockfish.get_best_move()
+            except Exception as e:
+                logger.warning("Error warming up engine: %s", e)
+                # Mark engine as crashed
+                self.stockfish = None
+                self._alive = False
+            finally:
+                # Restore the configured analysis depth
+                if self.stockfish is not None:
+                    try:
+                        self.stockfish.set_depth(self.depth)
+                    except:
+                        pass
+
     def set_skill_level(self, level: int):
         """
         Set engine skill level (0-20, where 20 is strongest).
@@ -187,14 +332,16 @@ class ChessEngine:
         Args:
             level: Skill level from 0 (weakest) to 20 (strongest)
         """
-        if self.is_available():
-            # Stockfish skill level goes from 0-20
-            skill = max(0, min(20, level))
-            try:
-                self.stockfish.set_skill_level(skill)
-                print(f"Engine skill level set to: {skill}")
-            except:
-                print("Could not set skill level")
+        with self._lock:
+            if self.is_available():
+                # Stockfish skill level goes from 0-20
+                skill = max(0, min(20, level))
+                try:
+                    self.stockfish.set_skill_level(skill)
+                    self._invalidate_cache()
+                    logger.info("Engine skill level set to: %s", skill)
+                except:
+                    logger.warning("Could not set skill level")
 
     def get_engine_info(self) -> dict:
         """Get information about the engine."""
@@ -213,19 +360,45 @@ class ChessEngine:
     def convert_uci_to_san(self, uci_move: str, fen: str) -> Optional[str]:
         """
         Convert UCI move to Standard Algebraic Notation.
-        
+
         Args:
             uci_move: Move in UCI format (e.g., 'e2e4')
             fen: Current position in FEN notation
-            
+
         Returns:
             Move in SAN format (e.g., 'e4') or None if conversion fails
         """
         try:
-    
             board = chess.Board(fen)
+        except:
+            return None
+        return self._san_from_board(board, uci_move)
+
+    @staticmethod
+    def _san_from_board(board: chess.Board, uci_move: str,
+                        legal_moves: Optional[set] = None) -> Optional[str]:
+        """
+        Convert a UCI move to SAN against an already-built board.
+
+        Callers converting several moves for the same position should
+        build the board (and optionally a legal-move set) once and reuse
+        them — FEN parsing and move generation per conversion is the
+        expensive part.
+
+        Args:
+            board: Board set to the position the move is played from
+            uci_move: Move in UCI format (e.g., 'e2e4')
+            legal_moves: Optional precomputed set(board.legal_moves)
+
+        Returns:
+            Move in SAN format (e.g., 'e4') or None if conversion fails
+        """
+        try:
             move = chess.Move.from_uci(uci_move)
-            if move in board.legal_moves:
+            if legal_moves is not None:
+                if move in legal_moves:
+                    return board.san(move)
+            elif move in board.legal_moves:
                 return board.san(move)
         except:
             pass
@@ -245,15 +418,24 @@ class ChessEngine:
             return "Engine not available for analysis."
         
         analysis = self.analyze_position(fen)
-        
+
         if 'error' in analysis:
             return analysis['error']
-        
+
+        # Build the conversion board (and its legal-move set) once for
+        # every SAN conversion below
+        try:
+            board = chess.Board(fen)
+            legal_set = set(board.legal_moves)
+        except:
+            board = None
+            legal_set = None
+
         result = []
-        
+
         # Best move
         if analysis['best_move']:
-            san_move = self.convert_uci_to_san(analysis['best_move'], fen)
+            san_move = self._san_from_board(board, analysis['best_move'], legal_set) if board else None
             move_display = san_move if san_move else analysis['best_move']
             result.append(f"Best move: {move_display}")
         
@@ -271,7 +453,7 @@ class ChessEngine:
         if analysis['top_moves'] and len(analysis['top_moves']) > 1:
             result.append("\nAlternative moves:")
             for i, move_info in enumerate(analysis['top_moves'][1:], 2):
-                san_move = self.convert_uci_to_san(move_info['move'], fen)
+                san_move = self._san_from_board(board, move_info['move'], legal_set) if board else None
                 move_display = san_move if san_move else move_info['move']
                 if move_info['evaluation'] is not None:
                     result.append(f"  {i}. {move_display} ({move_info['evaluation']:+.2f})")
@@ -282,57 +464,135 @@ class ChessEngine:
     
     def close(self):
         """Close the engine connection."""
-        if self.stockfish:
-            try:
-                # Stockfish library doesn't have explicit close method
-                self.stockfish = None
-            except:
-                pass
+        with self._lock:
+            self._invalidate_cache()
+            self._alive = False
+            if self._pool is not None:
+                self._pool.close()
+                self._pool = None
+            if self.stockfish:
+                try:
+                    # Stockfish library doesn't have explicit close method
+                    self.stockfish = None
+                except:
+                    pass
 
     # PRIVATE METHODS
     
     def _initialize_engine(self):
         """Initialize the Stockfish engine."""
+        # The filesystem probes ran once at import (_RESOLVED_STOCKFISH_PATH);
+        # engine construction and recovery just use the resolved path
+        path = self.engine_path or _RESOLVED_STOCKFISH_PATH or "stockfish"
+
+        try:
+            self.stockfish = Stockfish(path=path)
+            self.engine_path = path
+        except Exception as e:
+            logger.warning("Error initializing engine: %s", e)
+            self.stockfish = None
+
+        if self.stockfish is None:
+            self._alive = False
+            logger.warning("Could not initialize Stockfish engine; "
+                           "ensure stockfish.exe is in the project directory or system PATH.")
+            return
+
         try:
-            if self.engine_path and os.path.exists(self.engine_path):
-                self.stockfish = Stockfish(path=self.engine_path)
-                print(f"Stockfish engine initialized at: {self.engine_path}")
-            else:
-                # Direct path to stockfish.exe in the project directory
-                current_dir = os.path.dirname(os.path.abspath(__file__))
-                stockfish_path = os.path.join(current_dir, "stockfish.exe")
-                
-                if os.path.exists(stockfish_path):
-                    self.stockfish = Stockfish(path=stockfish_path)
-                    self.engine_path = stockfish_path
-                    print(f"Stockfish engine initialized at: {stockfish_path}")
-                else:
-                    # Fallback: try system PATH
-                    try:
-                        self.stockfish = Stockfish(path="stockfish")
-                        self.engine_path = "stockfish"
-                        print("Stockfish engine initialized from system PATH")
-                    except:
-                        self.stockfish = None
-                        
-            if self.stockfish is None:
-                print("Warning: Could not initialize Stockfish engine.")
-                print("Ensure stockfish.exe is in the project directory or system PATH.")
-                return
-                
             # Configure engine settings
             self.stockfish.set_depth(self.depth)
-            print(f"Stockfish engine initialized successfully at: {self.engine_path}")
-            
+            self._alive = True
+            logger.info("Stockfish engine initialized successfully at: %s", self.engine_path)
         except Exception as e:
-            print(f"Error initializing engine: {e}")
+            logger.warning("Error initializing engine: %s", e)
             self.stockfish = None
+            self._alive = False
 
     def recover_engine(self) -> bool:
         """Attempt to recover from engine crash by reinitializing."""
-        if self.stockfish is not None:
-            return True  # Engine is fine
-        
-        print("Attempting to recover Stockfish engine...")
-        self._initialize_engine()
-        return self.stockfish is not None
\ No newline at end of file
+        with self._lock:
+            if self.stockfish is not None:
+                return True  # Engine is fine
+
+            logger.info("Attempting to recover Stockfish engine...")
+            self._invalidate_cache()
+            self._initialized = True
+            self._initialize_engine()
+            return self.stockfish is not None
+
+
+class ChessEnginePool:
+    """Pool of Stockfish workers for parallel batch analysis.
+
+    Stockfish searches are CPU-bound native code and release the GIL
+    while the engine thinks, so independent positions parallelize well
+    across one single-threaded engine process per worker.
+    """
+
+    def __init__(self, stockfish_path: Optional[str] = None,
+                 size: Optional[int] = None, depth: int = 15):
+        """
+        Initialize the pool (engines are started lazily).
+
+        Args:
+            stockfish_path: Path to Stockfish executable
+            size: Number of worker engines; defaults to half the CPU count
+            depth: Search depth for each worker
+        """
+        if size is None:
+            size = max(1, (os.cpu_count() or 2) // 2)
+        self.size = size
+        self.depth = depth
+        self.stockfish_path = stockfish_path
+        self._engines = None
+        self._idle = None
+        self._executor = None
+
+    def _ensure_started(self) -> None:
+        """Start the worker engines on first use."""
+        if self._engines is not None:
+            return
+
+        self._engines = []
+        self._idle = queue.Queue()
+        for _ in range(self.size):
+            engine = ChessEngine(self.stockfish_path, depth=self.depth)
+            if not engine.is_available():
+                break
+            try:
+                # One search thread per worker so N workers use N cores
+                engine.stockfish.update_engine_parameters({"Threads": 1})
+            except Exception:
+                pass
+            self._engines.append(engine)
+            self._idle.put(engine)
+
+        self._executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=max(1, len(self._engines))
+        )
+
+    def _analyze_on_worker(self, fen: str) -> Dict:
+        """Borrow an idle engine, analyze one position, return the engine."""
+        engine = self._idle.get()
+        try:
+            return engine.analyze_position(fen)
+        finally:
+            self._idle.put(engine)
+
+    def analyze_positions(self, fen_list: List[str]) -> List[Dict]:
+        """Analyze a batch of positions across the worker pool."""
+        self._ensure_started()
+        if not self._engines:
+            return [{'error': 'Engine not available'} for _ in fen_list]
+        return list(self._executor.map(self._analyze_on_worker, fen_list))
+
+    def close(self) -> None:
+        """Shut down all worker engines."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+        if self._engines:
+            for engine in self._engines:
+                engine.close()
+        self._engines = None
+        self._idle = None
\ No newline at end of file
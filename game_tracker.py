@@ -1,18 +1,82 @@
 import chess
-import chess.pgn
+import logging
+from array import array
+from bisect import bisect_left
+from itertools import zip_longest
 from typing import List, Optional
 from datetime import datetime
 
+logger = logging.getLogger(__name__)
+
+# Indexed by chess.Color (False=Black, True=White): a tuple subscript
+# instead of a rich-compare against chess.WHITE per call
+_TURN_NAMES = ('Black', 'White')
+# (White header, Black header) indexed by the tracked player's color
+_PGN_PLAYERS = (('Player', 'Black'), ('White', 'Player'))
+
 class GameTracker:
     """Manages chess game state, move history, and PGN export."""
-    
+
+    # Centipawn-loss thresholds for move quality, sorted for bisect;
+    # None marks the "good move" band that isn't counted anywhere
+    _QUALITY_THRESHOLDS = (-2.0, 0.5, 1.0, 2.0)
+    _QUALITY_KEYS = ('excellent_moves', None, 'inaccuracies', 'mistakes', 'blunders')
+
+    # Upper bound on cached engine evaluations (cleared wholesale when
+    # full, same policy as the engine's own result cache)
+    EVAL_CACHE_SIZE = 4096
+
+
     # CONSTRUCTOR
 
     def __init__(self, player_color: chess.Color = chess.WHITE):
         self.board = chess.Board()
-        self.move_history: List[chess.Move] = []
+        # Moves packed into 16 bits each (from | to<<6 | promotion<<12):
+        # 2 bytes per ply instead of a ~56-byte Move object, so even a
+        # long game's history stays cache-resident for the replay loops
+        self._moves_u16 = array('H')
+        # SAN strings maintained incrementally as moves are made, so
+        # history/PGN queries never replay the game through the SAN
+        # generator (which scans legal moves per ply)
+        self._san_history: List[str] = []
+        # Rendered ASCII board keyed by position, so UIs that redraw on
+        # every event only pay for str(board) when the position changes
+        self._display_cache: Optional[tuple] = None
+        # Engine evaluations keyed by transposition key; repeated
+        # analysis runs (report + quality over the same game) and
+        # transposed positions skip the engine round-trip entirely
+        self._eval_cache: dict = {}
+        # SAN legal-move listing for the current position, keyed like
+        # the display cache
+        self._legal_moves_cache: Optional[tuple] = None
         self.player_color = player_color
         self.game_start_time = datetime.now()
+        # Callbacks invoked with the move count after each committed move
+        # (e.g. auto-save); push-based so observers never have to poll
+        self.move_listeners = []
+
+    @staticmethod
+    def _encode_move(move: chess.Move) -> int:
+        """Pack a move into 16 bits (from | to<<6 | promotion<<12)."""
+        return move.from_square | (move.to_square << 6) | ((move.promotion or 0) << 12)
+
+    @staticmethod
+    def _decode_move(code: int) -> chess.Move:
+        """Rebuild a chess.Move from its 16-bit encoding."""
+        return chess.Move(code & 63, (code >> 6) & 63, (code >> 12) or None)
+
+    @property
+    def move_history(self) -> List[chess.Move]:
+        """Move history decoded back into chess.Move objects."""
+        decode = self._decode_move
+        return [decode(code) for code in self._moves_u16]
+
+    def _notify_move_listeners(self) -> None:
+        """Notify registered observers that a move was committed."""
+        if self.move_listeners:
+            move_count = len(self._moves_u16)
+            for listener in self.move_listeners:
+                listener(move_count)
         
     # CORE GAME FUNCTIONS
 
@@ -27,20 +91,20 @@ class GameTracker:
             True if move was successful, False otherwise
         """
         try:
-            # Try to parse the move
+            # parse_san already rejects illegal moves, so no separate
+            # legality scan is needed
             move = self.board.parse_san(move_str)
-            
-            # Check if move is legal
-            if move in self.board.legal_moves:
-                self.board.push(move)
-                self.move_history.append(move)
-                return True
-            else:
-                print(f"Illegal move: {move_str}")
-                return False
-                
+            san = self.board.san(move)  # Must be computed before push
+            self.board.push(move)
+            self._moves_u16.append(self._encode_move(move))
+            self._san_history.append(san)
+            self._notify_move_listeners()
+            return True
+
         except ValueError as e:
-            print(f"Invalid move format: {move_str}. Error: {e}")
+            # Lazy %-formatting: the message is never built unless a
+            # handler at DEBUG level is attached
+            logger.debug("Invalid move format: %s. Error: %s", move_str, e)
             return False
     
     def make_move_uci(self, uci_move: str) -> bool:
@@ -55,15 +119,20 @@ class GameTracker:
         """
         try:
             move = chess.Move.from_uci(uci_move)
-            if move in self.board.legal_moves:
+            # is_legal() tests the move against the attack bitboards
+            # directly instead of generating and scanning every legal move
+            if self.board.is_legal(move):
+                san = self.board.san(move)  # Must be computed before push
                 self.board.push(move)
-                self.move_history.append(move)
+                self._moves_u16.append(self._encode_move(move))
+                self._san_history.append(san)
+                self._notify_move_listeners()
                 return True
             else:
-                print(f"Illegal move: {uci_move}")
+                logger.debug("Illegal move: %s", uci_move)
                 return False
         except ValueError as e:
-            print(f"Invalid UCI move: {uci_move}. Error: {e}")
+            logger.debug("Invalid UCI move: %s. Error: %s", uci_move, e)
             return False
     
     def undo_move(self) -> bool:
@@ -73,9 +142,10 @@ class GameTracker:
         Returns:
             True if undo was successful, False if no moves to undo
         """
-        if self.move_history:
+        if self._moves_u16:
             self.board.pop()
-            self.move_history.pop()
+            self._moves_u16.pop()
+            self._san_history.pop()
             return True
         return False
     
@@ -83,7 +153,16 @@ class GameTracker:
 
     def get_legal_moves(self) -> List[str]:
         """Get all legal moves in algebraic notation."""
-        return [self.board.san(move) for move in self.board.legal_moves]
+        # SAN disambiguation re-runs (masked) move generation per move,
+        # so the full listing is quadratic-ish in the move count; cache
+        # it per position the same way as the board display
+        key = self.board._transposition_key()
+        if self._legal_moves_cache is not None and self._legal_moves_cache[0] == key:
+            return list(self._legal_moves_cache[1])
+        moves = list(self.board.legal_moves)
+        san_moves = [self.board.san(move) for move in moves]
+        self._legal_moves_cache = (key, san_moves)
+        return list(san_moves)
     
     def get_board_fen(self) -> str:
         """Get current board position in FEN notation."""
@@ -91,148 +170,178 @@ class GameTracker:
     
     def is_game_over(self) -> bool:
         """Check if the game is over."""
-        return self.board.is_game_over()
+        return self.board.outcome() is not None
 
     def get_game_result(self) -> str:
         """Get the game result."""
-        if self.board.is_checkmate():
-            if self.board.turn == chess.WHITE:
-                return "0-1"  # Black wins
-            else:
-                return "1-0"  # White wins
-        elif self.board.is_stalemate() or self.board.is_insufficient_material():
-            return "1/2-1/2"  # Draw
-        else:
+        # outcome() checks every termination condition in a single pass
+        # instead of running legal-move generation per probe
+        outcome = self.board.outcome()
+        if outcome is None:
             return "*"  # Game ongoing
+        if outcome.winner is chess.WHITE:
+            return "1-0"
+        if outcome.winner is chess.BLACK:
+            return "0-1"
+        return "1/2-1/2"  # Draw
 
     def get_position_info(self) -> dict:
         """Get detailed information about current position."""
+        board = self.board
+        # count() tallies moves without materializing Move objects, and
+        # the checkers bitboard settles check/mate/stalemate with a
+        # single legal-move generation instead of up to three
+        legal_count = board.legal_moves.count()
+        in_check = bool(board.checkers())
         return {
-            'turn': 'White' if self.board.turn == chess.WHITE else 'Black',
-            'move_number': self.board.fullmove_number,
-            'is_check': self.board.is_check(),
-            'is_checkmate': self.board.is_checkmate(),
-            'is_stalemate': self.board.is_stalemate(),
-            'legal_moves_count': len(list(self.board.legal_moves)),
-            'fen': self.board.fen()
+            'turn': _TURN_NAMES[board.turn],
+            'move_number': board.fullmove_number,
+            'is_check': in_check,
+            'is_checkmate': in_check and legal_count == 0,
+            'is_stalemate': not in_check and legal_count == 0,
+            'legal_moves_count': legal_count,
+            'fen': board.fen()
         }
     # DISPLAY METHODS
 
     def get_board_display(self) -> str:
         """Get a text representation of the board."""
-        return str(self.board)
+        key = self.board._transposition_key()
+        if self._display_cache is not None and self._display_cache[0] == key:
+            return self._display_cache[1]
+        rendered = str(self.board)
+        self._display_cache = (key, rendered)
+        return rendered
 
     def get_move_history_san(self) -> List[str]:
         """Get move history in algebraic notation."""
-        # Recreate board to get SAN notation
-        temp_board = chess.Board()
-        san_moves = []
-        for move in self.move_history:
-            san_moves.append(temp_board.san(move))
-            temp_board.push(move)
-        return san_moves
+        # Maintained incrementally by make_move/make_move_uci
+        return list(self._san_history)
     
     # ANALYSIS METHODS
     
-    def get_game_statistics(self) -> dict:
-        """Get comprehensive game statistics."""
+    def _cached_evaluation(self, engine, board):
+        """Evaluate a position, caching results by transposition key."""
+        key = board._transposition_key()
+        cache = self._eval_cache
+        if key in cache:
+            return cache[key]
+        value = engine.get_evaluation(board.fen())
+        if value is not None:
+            if len(cache) >= self.EVAL_CACHE_SIZE:
+                cache.clear()
+            cache[key] = value
+        return value
+
+    def _replay_report(self, engine=None) -> tuple:
+        """
+        Walk the move history once, producing game statistics and,
+        when an available engine is passed, move quality analysis.
+
+        All report consumers share this single pass, so generating a
+        full report replays the game once instead of once per section.
+
+        Returns:
+            (stats, quality) tuple; quality is None without an engine
+        """
         stats = {
-            'total_moves': len(self.move_history),
+            'total_moves': len(self._moves_u16),
             'game_duration': (datetime.now() - self.game_start_time).total_seconds() / 60,  # minutes
             'captures': 0,
-        'checks': 0,
-        'castles': 0,
-        'promotions': 0,
-        'current_material': self._calculate_material()
-    }
-    
-        # Analyze moves for statistics
+            'checks': 0,
+            'castles': 0,
+            'promotions': 0,
+            'current_material': self._calculate_material()
+        }
+
+        use_engine = engine is not None and engine.is_available()
+        quality = None
+        if use_engine:
+            quality = {
+                'total_moves': len(self._moves_u16),
+                'blunders': 0,
+                'mistakes': 0,
+                'inaccuracies': 0,
+                'excellent_moves': 0,
+                'average_centipawn_loss': 0
+            }
+
+        if not self._moves_u16:
+            return stats, quality
+
+        # Single replay pass over the packed history, decoded once into
+        # Move objects up front. Bind the board methods to locals so the
+        # hot loop skips the attribute lookups on every ply.
+        moves = self.move_history
         temp_board = chess.Board()
-        for move in self.move_history:
-            move_obj = temp_board.parse_san(move) if isinstance(move, str) else move
-            
-            # Count captures
-            if temp_board.is_capture(move_obj):
-                stats['captures'] += 1
-            
-            # Count checks
-            temp_board.push(move_obj)
-            if temp_board.is_check():
-                stats['checks'] += 1
-            
-            # Count castles
-            if temp_board.is_castling(move_obj):
-                stats['castles'] += 1
-            
-            # Count promotions  
-            if move_obj.promotion:
-                stats['promotions'] += 1
-        
+        is_capture = temp_board.is_capture
+        is_castling = temp_board.is_castling
+        push = temp_board.push
+        is_check = temp_board.is_check
+        captures = checks = castles = promotions = 0
+        total_loss = 0
+        move_count = 0
+
+        # The evaluation after one move is the evaluation before the
+        # next, so each position is analyzed exactly once instead of
+        # twice per ply
+        eval_before = self._cached_evaluation(engine, temp_board) if use_engine else None
+
+        for move in moves:
+            # Captures and castling must be tested before the push
+            if is_capture(move):
+                captures += 1
+            if is_castling(move):
+                castles += 1
+            if move.promotion:
+                promotions += 1
+
+            push(move)
+            if is_check():
+                checks += 1
+
+            if use_engine:
+                eval_after = self._cached_evaluation(engine, temp_board)
+
+                if eval_before is not None and eval_after is not None:
+                    # Calculate centipawn loss (from the moving player's perspective)
+                    if temp_board.turn == chess.BLACK:  # White just moved
+                        loss = eval_before - eval_after
+                    else:  # Black just moved
+                        loss = eval_after - eval_before
+
+                    total_loss += abs(loss)
+                    move_count += 1
+
+                    # One binary search into the threshold table instead
+                    # of a branch ladder per ply
+                    key = self._QUALITY_KEYS[bisect_left(self._QUALITY_THRESHOLDS, loss)]
+                    if key is not None:
+                        quality[key] += 1
+
+                eval_before = eval_after
+
+        stats['captures'] = captures
+        stats['checks'] = checks
+        stats['castles'] = castles
+        stats['promotions'] = promotions
+
+        if move_count > 0:
+            quality['average_centipawn_loss'] = total_loss / move_count
+
+        return stats, quality
+
+    def get_game_statistics(self) -> dict:
+        """Get comprehensive game statistics."""
+        stats, _ = self._replay_report()
         return stats
 
     def analyze_game_quality(self, engine) -> dict:
         """Analyze the overall quality of the game using engine."""
         if not engine.is_available():
             return {"error": "Engine not available"}
-    
-        analysis = {
-        'total_moves': len(self.move_history),
-        'blunders': 0,
-        'mistakes': 0,
-        'inaccuracies': 0,
-        'excellent_moves': 0,
-        'average_centipawn_loss': 0
-    }
-    
-        temp_board = chess.Board()
-        total_loss = 0
-        move_count = 0
-    
-        for i, move in enumerate(self.move_history):
-            if isinstance(move, str):
-                move_obj = temp_board.parse_san(move)
-            else:
-                move_obj = move
-            
-        # Get position before move
-        pos_before = temp_board.fen()
-        
-        # Make the move
-        temp_board.push(move_obj)
-        
-        # Get position after move
-        pos_after = temp_board.fen()
-        
-        # Analyze both positions
-        eval_before = engine.get_evaluation(pos_before)
-        eval_after = engine.get_evaluation(pos_after)
-        
-        if eval_before is not None and eval_after is not None:
-            # Calculate centipawn loss (from the moving player's perspective)
-            if temp_board.turn == chess.BLACK:  # White just moved
-                loss = eval_before - eval_after
-            else:  # Black just moved
-                loss = eval_after - eval_before
-            
-            total_loss += abs(loss)
-            move_count += 1
-            
-            # Categorize move quality
-            if loss <= -2.0:
-                analysis['excellent_moves'] += 1
-            elif loss <= 0.5:
-                pass  # Good move, no penalty
-            elif loss <= 1.0:
-                analysis['inaccuracies'] += 1
-            elif loss <= 2.0:
-                analysis['mistakes'] += 1
-            else:
-                analysis['blunders'] += 1
-    
-        if move_count > 0:
-            analysis['average_centipawn_loss'] = total_loss / move_count
-    
-        return analysis
+        _, quality = self._replay_report(engine)
+        return quality
 
     # EXPORT/IMPORT METHODS
 
@@ -246,6 +355,10 @@ class GameTracker:
         Returns:
             PGN string representation of the game
         """
+        # Deferred: the PGN parser is only paid for by sessions that
+        # actually export, not on every import of this module
+        import chess.pgn
+
         game = chess.pgn.Game()
         
         # Set game headers
@@ -253,24 +366,21 @@ class GameTracker:
         game.headers["Site"] = "Chess Helper App"
         game.headers["Date"] = self.game_start_time.strftime("%Y.%m.%d")
         game.headers["Round"] = "1"
-        game.headers["White"] = "White" if self.player_color == chess.WHITE else "Player"
-        game.headers["Black"] = "Black" if self.player_color == chess.BLACK else "Player"
+        white_name, black_name = _PGN_PLAYERS[self.player_color]
+        game.headers["White"] = white_name
+        game.headers["Black"] = black_name
         game.headers["Result"] = self.get_game_result()
         
-        # Add moves
-        node = game
-        temp_board = chess.Board()
-        for move in self.move_history:
-            node = node.add_variation(move)
-            temp_board.push(move)
-        
+        # Add moves in one pass, no replay board needed
+        game.add_line(self.move_history)
+
         pgn_string = str(game)
         
         # Save to file if filename provided
         if filename:
             with open(filename, 'w') as f:
                 f.write(pgn_string)
-            print(f"Game saved to {filename}")
+            logger.info("Game saved to %s", filename)
         
         return pgn_string
     
@@ -280,67 +390,72 @@ class GameTracker:
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             filename = f"game_analysis_{timestamp}.txt"
     
-        stats = self.get_game_statistics()
-        quality = self.analyze_game_quality(engine)
-    
-        report_lines = [
-            "CHESS GAME ANALYSIS REPORT",
-            "=" * 50,
-        f"Date: {self.game_start_time.strftime('%Y-%m-%d %H:%M:%S')}",
-        f"Duration: {stats['game_duration']:.1f} minutes",
-        f"Total Moves: {stats['total_moves']}",
-        f"Result: {self.get_game_result()}",
-        "",
-        "GAME STATISTICS:",
-        f"  Captures: {stats['captures']}",
-        f"  Checks: {stats['checks']}",
-        f"  Castles: {stats['castles']}",
-        f"  Promotions: {stats['promotions']}",
-        f"  Material Balance: {stats['current_material']['advantage']:+d}",
-        "",
-        "MOVE QUALITY ANALYSIS:",
-        f"  Excellent moves: {quality.get('excellent_moves', 0)}",
-        f"  Inaccuracies: {quality.get('inaccuracies', 0)}",
-        f"  Mistakes: {quality.get('mistakes', 0)}",
-        f"  Blunders: {quality.get('blunders', 0)}",
-        f"  Average centipawn loss: {quality.get('average_centipawn_loss', 0):.2f}",
-        "",
-        "MOVE HISTORY:",
-        *self._format_move_history_for_report()
-    ]
-    
-        report_content = "\n".join(report_lines)
-    
+        stats, quality = self._replay_report(engine)
+        if quality is None:
+            quality = {"error": "Engine not available"}
+
+        # Stream straight to the file instead of assembling one big
+        # joined string; long games never build an intermediate buffer
         with open(filename, 'w') as f:
-            f.write(report_content)
-    
+            write = f.write
+            write("CHESS GAME ANALYSIS REPORT\n")
+            write("=" * 50 + "\n")
+            write(f"Date: {self.game_start_time.strftime('%Y-%m-%d %H:%M:%S')}\n")
+            write(f"Duration: {stats['game_duration']:.1f} minutes\n")
+            write(f"Total Moves: {stats['total_moves']}\n")
+            write(f"Result: {self.get_game_result()}\n")
+            write("\n")
+            write("GAME STATISTICS:\n")
+            write(f"  Captures: {stats['captures']}\n")
+            write(f"  Checks: {stats['checks']}\n")
+            write(f"  Castles: {stats['castles']}\n")
+            write(f"  Promotions: {stats['promotions']}\n")
+            write(f"  Material Balance: {stats['current_material']['advantage']:+d}\n")
+            write("\n")
+            write("MOVE QUALITY ANALYSIS:\n")
+            write(f"  Excellent moves: {quality.get('excellent_moves', 0)}\n")
+            write(f"  Inaccuracies: {quality.get('inaccuracies', 0)}\n")
+            write(f"  Mistakes: {quality.get('mistakes', 0)}\n")
+            write(f"  Blunders: {quality.get('blunders', 0)}\n")
+            write(f"  Average centipawn loss: {quality.get('average_centipawn_loss', 0):.2f}\n")
+            write("\n")
+            write("MOVE HISTORY:\n")
+            for line in self._format_move_history_for_report():
+                write(line + "\n")
+
         return filename
 
     def reset_game(self):
         """Reset the game to starting position."""
         self.board = chess.Board()
-        self.move_history = []
+        del self._moves_u16[:]
+        self._san_history = []
+        self._display_cache = None
         self.game_start_time = datetime.now()
 
     def _calculate_material(self) -> dict:
         """Calculate current material balance."""
-        piece_values = {
-            chess.PAWN: 1, chess.KNIGHT: 3, chess.BISHOP: 3,
-            chess.ROOK: 5, chess.QUEEN: 9, chess.KING: 0
-        }
-    
-        white_material = 0
-        black_material = 0
-    
-        for square in chess.SQUARES:
-            piece = self.board.piece_at(square)
-            if piece:
-                value = piece_values[piece.piece_type]
-                if piece.color == chess.WHITE:
-                    white_material += value
-                else:
-                    black_material += value
-    
+        # Count pieces straight off the bitboards instead of probing all
+        # 64 squares with piece_at(); bit_count() is a single POPCNT
+        board = self.board
+        white = board.occupied_co[chess.WHITE]
+        black = board.occupied_co[chess.BLACK]
+
+        white_material = (
+            (board.pawns & white).bit_count()
+            + 3 * (board.knights & white).bit_count()
+            + 3 * (board.bishops & white).bit_count()
+            + 5 * (board.rooks & white).bit_count()
+            + 9 * (board.queens & white).bit_count()
+        )
+        black_material = (
+            (board.pawns & black).bit_count()
+            + 3 * (board.knights & black).bit_count()
+            + 3 * (board.bishops & black).bit_count()
+            + 5 * (board.rooks & black).bit_count()
+            + 9 * (board.queens & black).bit_count()
+        )
+
         return {
             'white': white_material,
             'black': black_material,
@@ -350,19 +465,11 @@ class GameTracker:
     def _format_move_history_for_report(self) -> List[str]:
         """Format move history for the analysis report."""
         history = self.get_move_history_san()
-        formatted_lines = []
-    
-        for i in range(0, len(history), 2):
-            move_num = (i // 2) + 1
-            white_move = history[i]
-            black_move = history[i + 1] if i + 1 < len(history) else ""
-        
-        if black_move:
-            formatted_lines.append(f"{move_num:2d}. {white_move:<10s} {black_move}")
-        else:
-            formatted_lines.append(f"{move_num:2d}. {white_move}")
-    
-        return formatted_lines
+        # Pair white/black plies directly instead of striding by index;
+        # this also restores the per-pair append that the old loop lost
+        pairs = zip_longest(history[0::2], history[1::2])
+        return [f"{num:2d}. {white:<10s} {black}" if black else f"{num:2d}. {white}"
+                for num, (white, black) in enumerate(pairs, 1)]
     
     
     
@@ -1,14 +1,32 @@
 import tkinter as tk
+import tkinter.font as tkfont
 from tkinter import ttk, messagebox, filedialog
+import concurrent.futures
+import threading
 import chess
 from game_tracker import GameTracker
 from engine import ChessEngine
 from typing import Optional, Tuple
 import os
 
+# Display-cell (row*8+col) <-> chess square lookup tables for both board
+# orientations, so the draw and click paths never redo the coordinate
+# arithmetic or branch on player color per square
+_SQ_FOR_CELL_WHITE = tuple(chess.square(c, 7 - r) for r in range(8) for c in range(8))
+_SQ_FOR_CELL_BLACK = tuple(chess.square(7 - c, r) for r in range(8) for c in range(8))
+_CELL_FOR_SQ_WHITE = tuple((7 - chess.square_rank(sq), chess.square_file(sq)) for sq in chess.SQUARES)
+_CELL_FOR_SQ_BLACK = tuple((chess.square_rank(sq), 7 - chess.square_file(sq)) for sq in chess.SQUARES)
+
 class ChessGUI:
     """GUI interface for the chess helper app using tkinter."""
-    
+
+    # Lowercase every letter except the piece letters NBRQK, which stay
+    # uppercase; applied with str.translate in one C-level pass
+    _MOVE_TRANS = str.maketrans(
+        "ACDEFGHIJLMOPSTUVWXYZ",
+        "acdefghijlmopstuvwxyz",
+    )
+
     def __init__(self, stockfish_path: Optional[str] = None):
         self.root = tk.Tk()
         self.root.title("Chess Helper")
@@ -24,6 +42,43 @@ class ChessGUI:
         self.board_canvas = None
         self.analysis_enabled = True
         self.player_color = None  # Will be set by color selection dialog
+
+        # Canvas items are created once and mutated afterwards instead of
+        # delete("all")+recreate on every redraw; keyed by display cell
+        # (row, col) so orientation flips are just text/fill updates
+        self._square_items = {}
+        self._piece_items = {}
+        self._coord_items = {}
+        self._grid_items = []
+        self._cell_state = {}
+        self._layout_square_size = None
+        # Shared named fonts: resizing reconfigures these two objects
+        # instead of re-parsing a font tuple for each of 128 text items
+        self._piece_font = None
+        self._coord_font = None
+        # Pending after() id for the debounced resize redraw
+        self._resize_after_id = None
+        # Monotonic id used to drop stale async analysis results
+        self._analysis_job_id = 0
+        # Single worker so at most one thread ever drives the engine
+        # pipe at a time; superseded jobs are skipped by job id
+        self._analysis_executor = concurrent.futures.ThreadPoolExecutor(max_workers=1)
+        # Last text shown in the analysis panel, to skip no-op rewrites
+        self._last_analysis_text = None
+        # Number of plies already rendered into the history panel, so a
+        # move appends its own text instead of rebuilding the widget
+        self._history_rendered_plies = 0
+        # Set when an update is skipped because the window isn't
+        # viewable; the <Map> handler replays it on re-show
+        self._display_dirty = False
+        # Orientation lookup tables, rebound when player_color changes
+        self._sq_for_cell = _SQ_FOR_CELL_WHITE
+        self._cell_for_sq = _CELL_FOR_SQ_WHITE
+        self._tables_color = None
+        # Orientation the coordinate labels were last rendered for;
+        # they are static between orientation changes, so redraws never
+        # touch them
+        self._coord_labels_color = None
         
         # Chess piece symbols (Unicode) - High quality, scalable pieces
         self.piece_symbols = {
@@ -125,8 +180,9 @@ class ChessGUI:
         right_frame.grid(row=0, column=1, sticky="nsew", padx=(5, 10), pady=10)
         right_frame.grid_propagate(False)  # Don't let children control frame size
         
-        # Set minimum width for right panel
-        self.root.update_idletasks()
+        # Set minimum width for right panel; no update_idletasks() needed
+        # here — forcing a relayout mid-construction just adds a paint
+        # cycle, and configure() doesn't depend on current geometry
         right_frame.configure(width=300)
         
         # Chess board
@@ -150,6 +206,9 @@ class ChessGUI:
         
         # Bind resize event to update board size
         self.board_canvas.bind('<Configure>', self.on_canvas_resize)
+
+        # Replay any display update skipped while the window was hidden
+        self.root.bind('<Map>', self._on_window_mapped)
         
         # Bind mouse events
         self.board_canvas.bind("<Button-1>", self.on_square_click)
@@ -192,7 +251,9 @@ class ChessGUI:
         history_scroll_frame = ttk.Frame(history_frame)
         history_scroll_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
         
-        self.history_text = tk.Text(history_scroll_frame, width=25, state=tk.DISABLED, wrap=tk.WORD)
+        # Monospace keeps the move columns aligned without string padding
+        self.history_text = tk.Text(history_scroll_frame, width=25, state=tk.DISABLED, wrap=tk.WORD,
+                                    font="TkFixedFont")
         history_scrollbar = ttk.Scrollbar(history_scroll_frame, orient=tk.VERTICAL, command=self.history_text.yview)
         self.history_text.configure(yscrollcommand=history_scrollbar.set)
         
@@ -215,134 +276,222 @@ class ChessGUI:
                 return
         
         self._last_canvas_size = (event.width, event.height)
-        
+
         # Calculate new square size based on available space
         # Use the smaller dimension to ensure the board fits
         available_size = min(event.width - 20, event.height - 20)  # Leave some padding
         self.square_size = max(30, available_size // 8)  # Minimum 30px squares
-        
-        # Redraw the board with new size
+
+        # Tk fires dozens of Configure events during a window drag;
+        # coalesce them so the full redraw runs at most every 30ms
+        if self._resize_after_id is not None:
+            self.root.after_cancel(self._resize_after_id)
+        self._resize_after_id = self.root.after(30, self._do_resize_redraw)
+
+    def _do_resize_redraw(self):
+        """Run the redraw scheduled by a burst of resize events."""
+        self._resize_after_id = None
         self.draw_board()
     
-    def draw_board(self):
-        """Draw the chess board and pieces."""
-        self.board_canvas.delete("all")
-        
-        # Draw squares
+    def _build_board_items(self):
+        """Create every canvas item for the board exactly once."""
+        canvas = self.board_canvas
+
+        # Squares first so everything else stacks above them; the
+        # light/dark tags let base colors be applied in two batched
+        # calls instead of 64
         for row in range(8):
             for col in range(8):
-                x1 = col * self.square_size
-                y1 = row * self.square_size
-                x2 = x1 + self.square_size
-                y2 = y1 + self.square_size
-                
-                # Determine square color
-                is_light = (row + col) % 2 == 0
-                color = "#F0D9B5" if is_light else "#B58863"
-                
-                # Convert to chess coordinates based on player orientation
-                # User's pieces should always be at the bottom
-                if self.player_color == "white":
-                    square = chess.square(col, 7 - row)  # White at bottom (normal)
-                else:
-                    square = chess.square(7 - col, row)  # Black at bottom (flipped)
-                
-                # Highlight selected square
-                if square == self.selected_square:
-                    color = "#FFFF99"
-                
-                self.board_canvas.create_rectangle(
-                    x1, y1, x2, y2, 
-                    fill=color, 
-                    outline="black",
-                    tags=f"square_{square}"
+                shade = "light" if (row + col) % 2 == 0 else "dark"
+                self._square_items[(row, col)] = canvas.create_rectangle(
+                    0, 0, 0, 0, outline="black", tags=("square", shade)
                 )
-                
-                # Draw piece if present
-                piece = self.game.board.piece_at(square)
-                if piece:
-                    # Get piece symbol using simplified structure
-                    piece_char = piece.symbol()  # Returns 'P', 'p', 'R', 'r', etc.
-                    symbol = self.piece_symbols[piece_char]
-                    
-                    # Scale piece size with board size (larger board = larger pieces)
-                    piece_font_size = max(16, int(self.square_size * 0.6))
-                    
-                    self.board_canvas.create_text(
-                        x1 + self.square_size // 2,
-                        y1 + self.square_size // 2,
-                        text=symbol,
-                        font=("Arial", piece_font_size),
-                        fill="#000000",  # Solid black for better visibility
-                        tags=f"piece_{square}"
-                    )
-        
-        # Draw grid lines
-        board_size = 8 * self.square_size
-        for i in range(9):  # 9 lines for 8 squares
-            # Vertical lines
-            x = i * self.square_size
-            self.board_canvas.create_line(
-                x, 0, x, board_size,
-                fill="black", width=1
-            )
-            # Horizontal lines
-            y = i * self.square_size
-            self.board_canvas.create_line(
-                0, y, board_size, y,
-                fill="black", width=1
+        self._apply_base_square_fills()
+
+        # Pieces above the squares; empty cells keep an empty-text item
+        for row in range(8):
+            for col in range(8):
+                self._piece_items[(row, col)] = canvas.create_text(
+                    0, 0, text="", fill="#000000"  # Solid black for better visibility
+                )
+
+        # Grid lines (vertical then horizontal, 9 each)
+        for i in range(18):
+            self._grid_items.append(
+                canvas.create_line(0, 0, 0, 0, fill="black", width=1)
             )
-        
-        # Draw coordinates in every square for chess novices
-        coord_font_size = max(8, self.square_size // 8)  # Smaller font for in-square coordinates
-        
-        # Draw coordinates in each square to match board orientation
+
+        # Coordinate labels in every square for chess novices; text color
+        # contrasts with the square and never changes, so set it here
         for row in range(8):
             for col in range(8):
-                # Calculate square position
-                x1 = col * self.square_size
-                y1 = row * self.square_size
-                
-                # Calculate file and rank to match the piece orientation
-                # User's pieces are always at the bottom
-                if self.player_color == "white":
-                    file_letter = chr(ord('a') + col)
-                    rank_number = str(8 - row)
-                else:
-                    # Black at bottom - flip the coordinates
-                    file_letter = chr(ord('h') - col)
-                    rank_number = str(row + 1)
-                
-                square_name = f"{file_letter}{rank_number}"
-                
-                # Determine text color based on square color for good contrast
                 is_light = (row + col) % 2 == 0
                 text_color = "#8B4513" if is_light else "#F5DEB3"  # Dark brown on light, light on dark
-                
-                # Draw square coordinate in top-left corner
-                self.board_canvas.create_text(
-                    x1 + 8,
-                    y1 + 8,
-                    text=square_name,
-                    font=("Arial", coord_font_size, "bold"),
-                    fill=text_color,
-                    anchor="nw"
+                self._coord_items[(row, col)] = canvas.create_text(
+                    0, 0, text="", fill=text_color, anchor="nw"
                 )
-        
-        # Border coordinates removed - coordinates now shown in each square for novice players
+
+    def _apply_base_square_fills(self):
+        """Set every square to its base color in two tag-batched calls."""
+        self.board_canvas.itemconfigure("light", fill="#F0D9B5")
+        self.board_canvas.itemconfigure("dark", fill="#B58863")
+        # Seed the per-cell state so the first diff pass doesn't re-set
+        # the 64 fills the batch just applied
+        for row in range(8):
+            for col in range(8):
+                is_light = (row + col) % 2 == 0
+                base = "#F0D9B5" if is_light else "#B58863"
+                self._cell_state[(row, col)] = (base, "")
+
+    def _refresh_coord_labels(self):
+        """
+        Re-text the 64 coordinate labels for the current orientation.
+
+        Labels never change between orientation flips, so this runs on
+        a new-game color choice rather than on every redraw (the
+        tkinter stand-in for rendering them into a static overlay).
+        """
+        canvas = self.board_canvas
+        sq_for_cell = self._sq_for_cell
+        names = chess.SQUARE_NAMES
+        for row in range(8):
+            for col in range(8):
+                canvas.itemconfigure(self._coord_items[(row, col)],
+                                     text=names[sq_for_cell[row * 8 + col]])
+        self._coord_labels_color = self.player_color
+
+    def _layout_board_items(self):
+        """Position and size all board items for the current square size."""
+        canvas = self.board_canvas
+        size = self.square_size
+        # Scale piece size with board size (larger board = larger pieces)
+        piece_size = max(16, int(size * 0.6))
+        coord_size = max(8, size // 8)
+
+        # Tk propagates changes to a shared Font object to every item
+        # using it, so after the first layout a resize only needs these
+        # two configure calls instead of 128 per-item font updates
+        first_layout = self._piece_font is None
+        if first_layout:
+            self._piece_font = tkfont.Font(family="Arial", size=piece_size)
+            self._coord_font = tkfont.Font(family="Arial", size=coord_size, weight="bold")
+        else:
+            self._piece_font.configure(size=piece_size)
+            self._coord_font.configure(size=coord_size)
+
+        for row in range(8):
+            for col in range(8):
+                x1 = col * size
+                y1 = row * size
+                canvas.coords(self._square_items[(row, col)], x1, y1, x1 + size, y1 + size)
+                canvas.coords(self._piece_items[(row, col)], x1 + size // 2, y1 + size // 2)
+                canvas.coords(self._coord_items[(row, col)], x1 + 8, y1 + 8)
+                if first_layout:
+                    canvas.itemconfigure(self._piece_items[(row, col)], font=self._piece_font)
+                    canvas.itemconfigure(self._coord_items[(row, col)], font=self._coord_font)
+
+        board_size = 8 * size
+        for i in range(9):  # 9 lines for 8 squares
+            canvas.coords(self._grid_items[i], i * size, 0, i * size, board_size)
+            canvas.coords(self._grid_items[9 + i], 0, i * size, board_size, i * size)
+
+        self._layout_square_size = size
+
+    def draw_board(self):
+        """Draw the chess board and pieces (incremental after first call)."""
+        if not self._square_items:
+            self._build_board_items()
+        if self._layout_square_size != self.square_size:
+            self._layout_board_items()
+
+        canvas = self.board_canvas
+        # One snapshot of the occupied squares instead of 64 piece_at
+        # bitboard probes per redraw
+        piece_map = self.game.board.piece_map()
+        self._ensure_orientation_tables()
+        sq_for_cell = self._sq_for_cell
+        if self._coord_labels_color != self.player_color:
+            self._refresh_coord_labels()
+
+        for row in range(8):
+            for col in range(8):
+                # User's pieces are always at the bottom; the table
+                # bakes in the orientation
+                square = sq_for_cell[row * 8 + col]
+
+                # Determine square color, with selection highlight
+                if square == self.selected_square:
+                    color = "#FFFF99"
+                else:
+                    is_light = (row + col) % 2 == 0
+                    color = "#F0D9B5" if is_light else "#B58863"
+
+                piece = piece_map.get(square)
+                symbol = self.piece_symbols[piece.symbol()] if piece else ""
+
+                # Only touch Tk for components that actually changed; a
+                # move updates <=4 items, a selection toggle exactly 1
+                cell = (row, col)
+                state = (color, symbol)
+                prev = self._cell_state.get(cell)
+                if prev != state:
+                    if prev is None or prev[0] != color:
+                        canvas.itemconfigure(self._square_items[cell], fill=color)
+                    if prev is None or prev[1] != symbol:
+                        canvas.itemconfigure(self._piece_items[cell], text=symbol)
+                    self._cell_state[cell] = state
     
+    def _ensure_orientation_tables(self):
+        """Point the cell/square tables at the current orientation."""
+        if self._tables_color != self.player_color:
+            if self.player_color == "black":
+                self._sq_for_cell = _SQ_FOR_CELL_BLACK
+                self._cell_for_sq = _CELL_FOR_SQ_BLACK
+            else:
+                self._sq_for_cell = _SQ_FOR_CELL_WHITE
+                self._cell_for_sq = _CELL_FOR_SQ_WHITE
+            self._tables_color = self.player_color
+
+    def _cell_for_square(self, square: int) -> Tuple[int, int]:
+        """Map a chess square to its display cell for the current orientation."""
+        self._ensure_orientation_tables()
+        return self._cell_for_sq[square]
+
+    def _refresh_squares(self, squares):
+        """
+        Recolor only the given squares (selection highlight updates).
+
+        Selection clicks touch one or two squares, so repainting just
+        those beats even the incremental full-board diff.
+        """
+        if not self._square_items:
+            self.draw_board()
+            return
+        canvas = self.board_canvas
+        for square in squares:
+            if square is None:
+                continue
+            cell = self._cell_for_square(square)
+            if square == self.selected_square:
+                color = "#FFFF99"
+            else:
+                is_light = (cell[0] + cell[1]) % 2 == 0
+                color = "#F0D9B5" if is_light else "#B58863"
+            state = self._cell_state.get(cell)
+            if state is not None and state[0] != color:
+                canvas.itemconfigure(self._square_items[cell], fill=color)
+                self._cell_state[cell] = (color,) + state[1:]
+
     def square_from_coords(self, x: int, y: int) -> Optional[int]:
         """Convert canvas coordinates to chess square based on board orientation."""
         if 0 <= x < 8 * self.square_size and 0 <= y < 8 * self.square_size:
             col = x // self.square_size
             row = y // self.square_size
-            
-            # Convert to chess coordinates based on player orientation
-            # This must match the logic in draw_board
-            if self.player_color == "white":
-                return chess.square(col, 7 - row)  # White at bottom (normal)
-            else:
-                return chess.square(7 - col, row)  # Black at bottom (flipped)
+
+            # Same table as draw_board, so click mapping can't drift
+            # from the drawn orientation
+            self._ensure_orientation_tables()
+            return self._sq_for_cell[row * 8 + col]
         return None
     
     def on_square_click(self, event):
@@ -356,39 +505,44 @@ class ChessGUI:
             piece = self.game.board.piece_at(square)
             if piece and piece.color == self.game.board.turn:
                 self.selected_square = square
-                self.draw_board()
+                self._refresh_squares((square,))
         else:
             # Try to make a move
             if square == self.selected_square:
                 # Deselect
                 self.selected_square = None
-                self.draw_board()
+                self._refresh_squares((square,))
             else:
                 # Attempt move
                 try:
                     move = chess.Move(self.selected_square, square)
-                    
-                    # Check for pawn promotion
+
+                    # Check for pawn promotion: one bitboard test for
+                    # landing on a back rank
                     piece = self.game.board.piece_at(self.selected_square)
-                    if (piece and piece.piece_type == chess.PAWN and 
-                        (chess.square_rank(square) == 7 or chess.square_rank(square) == 0)):
+                    if (piece and piece.piece_type == chess.PAWN and
+                            chess.BB_SQUARES[square] & (chess.BB_RANK_1 | chess.BB_RANK_8)):
                         # Promote to queen by default (could add promotion dialog)
                         move.promotion = chess.QUEEN
-                    
-                    # Make the move
-                    if move in self.game.board.legal_moves:
+
+                    # is_legal tests against the attack bitboards instead
+                    # of generating and scanning every legal move
+                    if self.game.board.is_legal(move):
                         san_move = self.game.board.san(move)
                         self.game.make_move(san_move)
                         self.selected_square = None
                         self.update_display()
+                        self._check_game_over()
                     else:
                         # Invalid move
+                        old_selected = self.selected_square
                         self.selected_square = None
-                        self.draw_board()
-                        
+                        self._refresh_squares((old_selected,))
+
                 except Exception as e:
+                    old_selected = self.selected_square
                     self.selected_square = None
-                    self.draw_board()
+                    self._refresh_squares((old_selected,))
                     messagebox.showerror("Invalid Move", f"Cannot make that move: {e}")
     
     def on_manual_move(self, event=None):
@@ -397,114 +551,148 @@ class ChessGUI:
         if not move_str:
             return
         
-        # Make move input case-insensitive for user convenience
-        # Convert to lowercase except for piece letters which should be uppercase
-        normalized_move = ""
-        for i, char in enumerate(move_str):
-            if i == 0 and char.lower() in 'nbrqk':  # Piece notation (Knight, Bishop, Rook, Queen, King)
-                normalized_move += char.upper()
-            elif char in 'NBRQK':  # Handle uppercase piece letters anywhere
-                normalized_move += char
-            else:
-                normalized_move += char.lower()
+        # Make move input case-insensitive for user convenience:
+        # lowercase everything except piece letters, then promote a
+        # leading piece letter (Knight, Bishop, Rook, Queen, King)
+        normalized_move = move_str.translate(self._MOVE_TRANS)
+        if normalized_move[0] in 'nbrqk':
+            normalized_move = normalized_move[0].upper() + normalized_move[1:]
         
         if self.game.make_move(normalized_move):
             self.move_entry.delete(0, tk.END)
             self.update_display()
-            result = self.game.get_game_result()
-            result_text = {
-                "1-0": "White wins!",
-                "0-1": "Black wins!",
-                "1/2-1/2": "Draw!",
-                "*": "Game ongoing"
-            }.get(result, "Game over")
-            
-            if result != "*":
-                messagebox.showinfo("Game Over", result_text)
+            self._check_game_over()
         else:
             messagebox.showerror("Invalid Move", f"Cannot make move: {move_str}")
     
     def update_display(self):
         """Update all display elements."""
+        # Minimized/hidden windows get no redraws and queue no engine
+        # work; the pending update replays when the window maps again
+        try:
+            viewable = self.root.winfo_viewable()
+        except tk.TclError:
+            viewable = False
+        if not viewable:
+            self._display_dirty = True
+            return
+        self._display_dirty = False
+
         self.draw_board()
         self.update_analysis_panel()
         self.update_history_panel()
-        
-        # Check for game over
-        if self.game.is_game_over():
-            result = self.game.get_game_result()
+
+    def _check_game_over(self):
+        """Show the game-over dialog once, after a committed move."""
+        result = self.game.get_game_result()
+        if result != "*":
             result_text = {
                 "1-0": "White wins!",
                 "0-1": "Black wins!",
-                "1/2-1/2": "Draw!",
-                "*": "Game ongoing"
+                "1/2-1/2": "Draw!"
             }.get(result, "Game over")
-            
-            if result != "*":
-                messagebox.showinfo("Game Over", result_text)
+            messagebox.showinfo("Game Over", result_text)
     
+    def _set_analysis_text(self, text):
+        """Replace the contents of the analysis panel."""
+        if text == self._last_analysis_text:
+            return  # e.g. "Analysis disabled" re-shown on every move
+        self._last_analysis_text = text
+        self.analysis_text.config(state=tk.NORMAL)
+        # One replace call instead of a delete + insert pair, halving
+        # the Tcl-boundary crossings on every refresh
+        self.analysis_text.replace("1.0", tk.END, text)
+        self.analysis_text.config(state=tk.DISABLED)
+
+    def _on_window_mapped(self, event=None):
+        """Run the deferred display update when the window re-shows."""
+        if self._display_dirty:
+            self.update_display()
+
     def update_analysis_panel(self):
         """Update the engine analysis panel."""
+        # Any text shown below supersedes in-flight analysis results
+        self._analysis_job_id += 1
+
         if not self.analysis_enabled:
-            self.analysis_text.config(state=tk.NORMAL)
-            self.analysis_text.delete(1.0, tk.END)
-            self.analysis_text.insert(1.0, "Analysis disabled")
-            self.analysis_text.config(state=tk.DISABLED)
+            self._set_analysis_text("Analysis disabled")
             return
-        
-        # Try to recover engine if it's crashed
-        if not self.engine.is_available():
-            if not self.engine.recover_engine():
-                self.analysis_text.config(state=tk.NORMAL)
-                self.analysis_text.delete(1.0, tk.END)
-                self.analysis_text.insert(1.0, "Engine crashed\n\nTrying to recover...\n\nIf problems persist,\nrestart the application")
-                self.analysis_text.config(state=tk.DISABLED)
-                return
-        
+
         if self.game.is_game_over():
-            self.analysis_text.config(state=tk.NORMAL)
-            self.analysis_text.delete(1.0, tk.END)
-            self.analysis_text.insert(1.0, "Game over")
-            self.analysis_text.config(state=tk.DISABLED)
+            self._set_analysis_text("Game over")
             return
-        
+
         # Show analysis for both user and opponent moves
         current_turn = self.game.board.turn  # True for White, False for Black
         turn_color = "White" if current_turn else "Black"
-        
-        self.analysis_text.config(state=tk.NORMAL)
-        self.analysis_text.delete(1.0, tk.END)
-        
+
+        # Run the engine off the Tk thread so thinking time never
+        # freezes mouse, resize or history events.  A single-worker
+        # executor (not a thread per refresh) serializes all engine
+        # traffic: two quick moves would otherwise put two concurrent
+        # searches on the same Stockfish pipe.  Results are marshalled
+        # back via after() and stale ones dropped by job id.
+        self._set_analysis_text(f"{turn_color} to move\n\nAnalyzing...")
+        self._analysis_executor.submit(
+            self._run_analysis, self._analysis_job_id,
+            self.game.get_board_fen(), turn_color)
+
+    def _run_analysis(self, job_id, fen, turn_color):
+        """Worker-thread half of update_analysis_panel."""
         try:
-            analysis_text = self.engine.get_move_analysis_text(self.game.get_board_fen())
-            # Add turn indicator
-            self.analysis_text.insert(1.0, f"{turn_color} to move\n\n{analysis_text}")
+            if job_id != self._analysis_job_id:
+                return  # Superseded while queued; skip the engine call
+            # Crash recovery runs here too, so the engine process is
+            # never replaced underneath a search in progress
+            if not self.engine.is_available() and not self.engine.recover_engine():
+                text = "Engine crashed\n\nTrying to recover...\n\nIf problems persist,\nrestart the application"
+            else:
+                analysis_text = self.engine.get_move_analysis_text(fen)
+                # Add turn indicator
+                text = f"{turn_color} to move\n\n{analysis_text}"
         except Exception as e:
-            self.analysis_text.insert(1.0, f"Analysis error: {e}")
-        
-        self.analysis_text.config(state=tk.DISABLED)
+            text = f"Analysis error: {e}"
+        self.root.after(0, self._apply_analysis, job_id, text)
+
+    def _apply_analysis(self, job_id, text):
+        """Display a finished analysis unless it has been superseded."""
+        if job_id != self._analysis_job_id:
+            return
+        self._set_analysis_text(text)
     
+    @staticmethod
+    def _format_history_plies(history, start, stop):
+        """Format plies [start, stop) as numbered move-list text."""
+        parts = []
+        for i in range(start, stop):
+            san = history[i]
+            if i % 2 == 0:
+                # White ply opens a new numbered line
+                prefix = "\n" if i > 0 else ""
+                parts.append(f"{prefix}{i // 2 + 1:2d}. {san}")
+            else:
+                parts.append(f" {san}")
+        return "".join(parts)
+
     def update_history_panel(self):
-        """Update the move history panel."""
+        """Update the move history panel (appends only the new plies)."""
         history = self.game.get_move_history_san()
-        
-        history_lines = []
-        for i in range(0, len(history), 2):
-            move_num = (i // 2) + 1
-            white_move = history[i]
-            black_move = history[i + 1] if i + 1 < len(history) else ""
-            
-            if black_move:
-                history_lines.append(f"{move_num:2d}. {white_move:8s} {black_move}")
-            else:
-                history_lines.append(f"{move_num:2d}. {white_move}")
-        
+        n = len(history)
+
         self.history_text.config(state=tk.NORMAL)
-        self.history_text.delete(1.0, tk.END)
-        if history_lines:
-            self.history_text.insert(1.0, "\n".join(history_lines))
+
+        if n < self._history_rendered_plies:
+            # Undo or new game shrank the history: rebuild with a single
+            # replace call instead of a delete + insert pair
+            self.history_text.replace("1.0", tk.END, self._format_history_plies(history, 0, n))
+            self._history_rendered_plies = n
+        elif n > self._history_rendered_plies:
+            self.history_text.insert(
+                tk.END, self._format_history_plies(history, self._history_rendered_plies, n))
+            self._history_rendered_plies = n
+
         self.history_text.config(state=tk.DISABLED)
-        
+
         # Auto-scroll to bottom
         self.history_text.see(tk.END)
     
@@ -566,17 +754,34 @@ class ChessGUI:
             defaultextension=".pgn",
             filetypes=[("PGN files", "*.pgn"), ("All files", "*.*")]
         )
-        if filename:
-            try:
-                self.game.export_pgn(filename)
-                messagebox.showinfo("Save", f"Game saved to {filename}")
-                return True
-            except Exception as e:
-                messagebox.showerror("Save Error", f"Could not save game: {e}")
-                return False
-        else:
+        if not filename:
             # User cancelled the save dialog
             return False
+
+        # Write on a worker thread so a slow disk can't freeze the board;
+        # wait_variable keeps pumping the event loop until the worker
+        # reports back, preserving the bool contract for new_game
+        done = tk.BooleanVar(self.root)
+        threading.Thread(target=self._do_export, args=(filename, done), daemon=True).start()
+        self.root.wait_variable(done)
+        return done.get()
+
+    def _do_export(self, filename, done):
+        """Worker-thread PGN write; marshals the outcome back to Tk."""
+        try:
+            self.game.export_pgn(filename)
+            error = None
+        except Exception as e:
+            error = e
+        self.root.after(0, self._save_done, filename, error, done)
+
+    def _save_done(self, filename, error, done):
+        """Main-thread completion: report the result and release save_pgn."""
+        if error is None:
+            messagebox.showinfo("Save", f"Game saved to {filename}")
+        else:
+            messagebox.showerror("Save Error", f"Could not save game: {error}")
+        done.set(error is None)
     
     def load_pgn(self):
         """Load a game from PGN file."""
@@ -603,6 +808,9 @@ class ChessGUI:
             )
         
         self.root.mainloop()
+        # Don't let a queued analysis keep the process alive after the
+        # window closes; a running search finishes on its own thread
+        self._analysis_executor.shutdown(wait=False, cancel_futures=True)
 
 def main():
     """Main entry point for GUI."""
@@ -18,28 +18,29 @@ Options:
 
 import sys
 import argparse
+import importlib.util
+import json
 import os
 from typing import Optional
 
+# Remembers where Stockfish was found so later launches skip the PATH walk
+_STOCKFISH_CACHE = os.path.join(os.path.expanduser("~"), ".chess_helper_cache.json")
+
 def check_dependencies():
     """Check if required dependencies are installed."""
-    missing_deps = []
-    
-    try:
-        import chess
-    except ImportError:
-        missing_deps.append("python-chess")
-    
-    try:
-        import stockfish
-    except ImportError:
-        missing_deps.append("stockfish")
-    
-    try:
-        import tkinter
-    except ImportError:
-        missing_deps.append("tkinter")
-    
+    # find_spec only probes the import machinery; the modules
+    # themselves (tkinter in particular spins up Tcl) load lazily in
+    # whichever interface branch actually uses them
+    missing_deps = [
+        package
+        for module, package in (
+            ("chess", "python-chess"),
+            ("stockfish", "stockfish"),
+            ("tkinter", "tkinter"),
+        )
+        if importlib.util.find_spec(module) is None
+    ]
+
     if missing_deps:
         print("Missing required dependencies:")
         for dep in missing_deps:
@@ -49,21 +50,54 @@ def check_dependencies():
     
     return True
 
+def _read_cached_stockfish():
+    """Return the cached Stockfish path if it is still valid."""
+    try:
+        with open(_STOCKFISH_CACHE) as f:
+            cached = json.load(f)
+        # A corrupted file can parse to any JSON value; only a dict is a
+        # usable cache, anything else is treated as a miss
+        if not isinstance(cached, dict):
+            return None
+        path = cached.get("stockfish_path")
+        # Re-validate cheaply: the file must still exist and be the
+        # same binary (mtime) that was cached
+        if path and os.path.exists(path) and os.path.getmtime(path) == cached.get("mtime"):
+            return path
+    except (OSError, ValueError):
+        pass
+    return None
+
+def _write_cached_stockfish(path):
+    """Remember a discovered Stockfish path for future launches."""
+    try:
+        with open(_STOCKFISH_CACHE, 'w') as f:
+            json.dump({"stockfish_path": path, "mtime": os.path.getmtime(path)}, f)
+    except OSError:
+        pass  # Caching is best-effort; discovery still works without it
+
 def find_stockfish():
     """Get path to Stockfish executable in project directory."""
+    # A validated cache hit skips the directory probe and PATH walk
+    cached = _read_cached_stockfish()
+    if cached:
+        return cached
+
     # Direct path to stockfish.exe in the project directory
     current_dir = os.path.dirname(os.path.abspath(__file__))
     stockfish_path = os.path.join(current_dir, "stockfish.exe")
-    
+
     if os.path.exists(stockfish_path):
+        _write_cached_stockfish(stockfish_path)
         return stockfish_path
-    
+
     # Fallback: check if stockfish is in PATH
     import shutil
     system_stockfish = shutil.which("stockfish")
     if system_stockfish:
+        _write_cached_stockfish(system_stockfish)
         return system_stockfish
-    
+
     return None
 
 def main():